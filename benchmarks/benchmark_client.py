@@ -0,0 +1,210 @@
+# coding: utf-8
+
+# Copyright 2020-2022 IFREMER (Brest, FRANCE), all rights reserved.
+# contact -- mailto:nicolas.raillard@ifremer.fr
+#
+# This file is part of Resourcecode.
+#
+# Resourcecode is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3.0 of the License, or any later version.
+#
+# Resourcecode is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along
+# with Resourcecode. If not, see <https://www.gnu.org/licenses/>.
+
+"""End-to-end throughput benchmark of the Client.
+
+The client queries a local stand-in of the cassandra database, that answers
+with synthetic data (see `tests.server.synthetic_timeseries_server`). For each
+scenario, the benchmark measures the requests per second, the MB per second,
+the time spent decoding the responses, and the peak memory of the extraction.
+
+Run it from the root of the repository::
+
+    python -m benchmarks.benchmark_client
+    python -m benchmarks.benchmark_client --latency 0.05 --output results.json
+    python -m benchmarks.benchmark_client --baseline results.json
+
+With `--baseline`, the exit code is 1 if a scenario is slower, or uses more
+memory, than in the baseline results (beyond the tolerance).
+"""
+
+import sys
+import json
+import time
+import argparse
+import warnings
+import tracemalloc
+from datetime import datetime
+
+import resourcecode
+from resourcecode.client import STREAM_CHUNK_SIZE, TimeseriesDecoder
+from resourcecode.derived import get_sources
+
+from tests.server import _cached_synthetic_timeseries, synthetic_timeseries_server
+
+SCENARIOS = {
+    "single-point": {"points": [42], "parameters": ["hs"], "years": 10},
+    "multi-parameter": {
+        "points": [42],
+        "parameters": ["hs", "tp", "dir", "t02", "wspd", "wdir"],
+        "years": 10,
+    },
+    "multi-point": {
+        "points": list(range(1, 17)),
+        "parameters": ["hs", "tp"],
+        "years": 2,
+    },
+}
+
+START_DATE = datetime(2000, 1, 1)
+
+
+def _extract(client, scenario):
+    end_date = START_DATE.replace(year=START_DATE.year + scenario["years"])
+    if len(scenario["points"]) == 1:
+        client.get_dataframe(
+            scenario["points"][0], START_DATE, end_date, scenario["parameters"]
+        )
+        return
+    _, errors = client.get_dataframes(
+        scenario["points"], START_DATE, end_date, scenario["parameters"]
+    )
+    if errors:
+        raise RuntimeError(f"the extraction failed: {errors}")
+
+
+def _parse_time(scenario, time_step):
+    """Return the time spent decoding the responses of the scenario"""
+    start = START_DATE.timestamp()
+    end = START_DATE.replace(year=START_DATE.year + scenario["years"]).timestamp()
+    bodies = [
+        _cached_synthetic_timeseries(source, start, end, time_step)
+        for source in get_sources(scenario["parameters"])
+    ] * len(scenario["points"])
+
+    start_time = time.perf_counter()
+    for body in bodies:
+        decoder = TimeseriesDecoder()
+        for i in range(0, len(body), STREAM_CHUNK_SIZE):
+            decoder.feed(body[i : i + STREAM_CHUNK_SIZE])
+        decoder.result()
+    return time.perf_counter() - start_time
+
+
+def run_scenario(client, statistics, scenario, repeat, time_step):
+    """Run the scenario `repeat` times, and return its best measures"""
+
+    # warm up: the server generates and caches its responses.
+    _extract(client, scenario)
+
+    durations = []
+    for _ in range(repeat):
+        requests, bytes_sent = statistics.requests, statistics.bytes_sent
+        start_time = time.perf_counter()
+        _extract(client, scenario)
+        durations.append(time.perf_counter() - start_time)
+        requests = statistics.requests - requests
+        bytes_sent = statistics.bytes_sent - bytes_sent
+
+    tracemalloc.start()
+    _extract(client, scenario)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    duration = min(durations)
+    return {
+        "duration_s": duration,
+        "requests": requests,
+        "requests_per_s": requests / duration,
+        "mb_per_s": bytes_sent / duration / 1e6,
+        "parse_time_s": _parse_time(scenario, time_step),
+        "peak_memory_mb": peak_memory / 1e6,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Return the regressions of the results, compared to the baseline"""
+    regressions = []
+    for name, measures in results.items():
+        if name not in baseline:
+            continue
+        for key in ("duration_s", "parse_time_s", "peak_memory_mb"):
+            reference = baseline[name][key]
+            if measures[key] > reference * (1 + tolerance):
+                regressions.append(
+                    f"{name}: {key} is {measures[key]:.3f} "
+                    f"(baseline {reference:.3f})"
+                )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scenario", choices=list(SCENARIOS), action="append", dest="scenarios"
+    )
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="server latency, in seconds"
+    )
+    parser.add_argument(
+        "--time-step",
+        type=float,
+        default=3600.0,
+        help="time between two records, in seconds",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-workers", type=int, default=None)
+    parser.add_argument("--dtype", default="float64")
+    parser.add_argument("--output", help="write the results to this json file")
+    parser.add_argument("--baseline", help="compare to the results of this file")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    # as in the database, the timestamps of the null records are missing: the
+    # index of a single parameter extraction then has NaT values.
+    warnings.filterwarnings("ignore", "invalid value encountered in cast")
+
+    results = {}
+    with synthetic_timeseries_server(args.latency, args.time_step) as (url, stats):
+        client = resourcecode.Client(
+            max_workers=args.max_workers,
+            dtype=args.dtype,
+            cache_dir="",
+            rate_limit=0,
+            retries=0,
+        )
+        client.config.set("default", "cassandra-base-url", url)
+        with client:
+            for name in args.scenarios or SCENARIOS:
+                results[name] = run_scenario(
+                    client, stats, SCENARIOS[name], args.repeat, args.time_step
+                )
+
+    header = ("scenario", *next(iter(results.values())))
+    print(" ".join(f"{column:>16}" for column in header))
+    for name, measures in results.items():
+        print(
+            f"{name:>16} " + " ".join(f"{value:>16.3f}" for value in measures.values())
+        )
+
+    if args.output:
+        with open(args.output, "w") as fobj:
+            json.dump(results, fobj, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as fobj:
+            regressions = compare(results, json.load(fobj), args.tolerance)
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
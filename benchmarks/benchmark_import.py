@@ -0,0 +1,118 @@
+# coding: utf-8
+
+# Copyright 2020-2022 IFREMER (Brest, FRANCE), all rights reserved.
+# contact -- mailto:nicolas.raillard@ifremer.fr
+#
+# This file is part of Resourcecode.
+#
+# Resourcecode is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3.0 of the License, or any later version.
+#
+# Resourcecode is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along
+# with Resourcecode. If not, see <https://www.gnu.org/licenses/>.
+
+"""Import time benchmark of the package.
+
+Each module is imported in a new interpreter, several times, and the best time
+is reported, with the time spent importing pandas (that `resourcecode` always
+imports) for reference.
+
+Run it from the root of the repository::
+
+    python -m benchmarks.benchmark_import
+    python -m benchmarks.benchmark_import --output results.json
+    python -m benchmarks.benchmark_import --baseline results.json
+
+With `--baseline`, the exit code is 1 if a module is slower to import than in
+the baseline results (beyond the tolerance).
+"""
+
+import sys
+import json
+import argparse
+import subprocess
+
+MODULES = ["pandas", "resourcecode", "resourcecode.client", "resourcecode.io"]
+
+# the modules that `import resourcecode` must not import
+HEAVY_MODULES = ["requests", "aiohttp", "xarray", "scipy", "plotly"]
+
+
+def import_time(module: str) -> float:
+    """Return the time spent importing the module in a new interpreter, in
+    seconds"""
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {module}; print(time.perf_counter() - start)"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    return float(output)
+
+
+def imported_modules(module: str, candidates: list) -> list:
+    """Return the candidates imported by the import of the module"""
+    code = (
+        f"import sys; import {module}; "
+        f"print(','.join(m for m in {candidates!r} if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout.strip()
+    return output.split(",") if output else []
+
+
+def compare(results, baseline, tolerance):
+    """Return the regressions of the results, compared to the baseline"""
+    regressions = []
+    for module, duration in results.items():
+        if module in baseline and duration > baseline[module] * (1 + tolerance):
+            regressions.append(
+                f"{module}: import takes {duration:.3f}s "
+                f"(baseline {baseline[module]:.3f}s)"
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write the results to this json file")
+    parser.add_argument("--baseline", help="compare to the results of this file")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = {
+        module: min(import_time(module) for _ in range(args.repeat))
+        for module in MODULES
+    }
+    for module, duration in results.items():
+        print(f"{module:>24} {duration:>8.3f}s")
+
+    regressions = [
+        f"resourcecode: imports {module}"
+        for module in imported_modules("resourcecode", HEAVY_MODULES)
+    ]
+
+    if args.output:
+        with open(args.output, "w") as fobj:
+            json.dump(results, fobj, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as fobj:
+            regressions.extend(compare(results, json.load(fobj), args.tolerance))
+
+    for regression in regressions:
+        print(f"regression: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
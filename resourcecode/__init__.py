@@ -18,36 +18,158 @@
 # You should have received a copy of the GNU General Public License along
 # with Resourcecode. If not, see <https://www.gnu.org/licenses/>.
 
+"""Tools to extract and analyse the data of the Resourcecode hindcast database.
+
+The heavy dependencies are loaded on first use: the clients, the data helpers
+and the submodules are imported when they are first accessed (for instance
+`resourcecode.Client`), not when the package is imported.
+"""
+
+import sys
+import importlib
+import importlib.abc
+import importlib.machinery
+from typing import TYPE_CHECKING, Any, Optional, Sequence
+
 import pandas as pd
 from pandas.core.base import PandasObject
-import plotly.io as pio
 
-from resourcecode.client import Client
 from resourcecode.__version__ import __version__
-from resourcecode.io import to_netcdf, read_netcdf
-from resourcecode.data import (
-    get_coastline,
-    get_grid_field,
-    get_grid_spec,
-    get_islands,
-    get_triangles,
-    get_variables,
-    get_closest_point,
-    get_closest_station,
-)
-
-# load the resourcecode plotly theme
-import resourcecode.plotly_theme  # noqa
-
-pio.templates.default = "plotly+resourcecode"
+
+if TYPE_CHECKING:
+    from resourcecode.client import Client
+    from resourcecode.async_client import AsyncClient
+    from resourcecode.data import (
+        get_coastline,
+        get_grid_field,
+        get_grid_spec,
+        get_islands,
+        get_triangles,
+        get_variables,
+        get_closest_point,
+        get_closest_station,
+        get_closest_points,
+        get_closest_stations,
+        get_interpolation_weights,
+        get_points_in_bbox,
+        get_points_in_polygon,
+        get_points_in_radius,
+        get_mesh_adjacency,
+        get_neighbours,
+        get_mesh_components,
+        get_shortest_path,
+        get_distance_to_coast,
+        get_grid_distance_to_coast,
+    )
+
+# the attributes of the package, and the modules they are imported from on
+# first access
+_LAZY_ATTRIBUTES = {
+    "Client": "resourcecode.client",
+    "AsyncClient": "resourcecode.async_client",
+    "get_coastline": "resourcecode.data",
+    "get_grid_field": "resourcecode.data",
+    "get_grid_spec": "resourcecode.data",
+    "get_islands": "resourcecode.data",
+    "get_triangles": "resourcecode.data",
+    "get_variables": "resourcecode.data",
+    "get_closest_point": "resourcecode.data",
+    "get_closest_station": "resourcecode.data",
+    "get_closest_points": "resourcecode.data",
+    "get_closest_stations": "resourcecode.data",
+    "get_interpolation_weights": "resourcecode.data",
+    "get_points_in_bbox": "resourcecode.data",
+    "get_points_in_polygon": "resourcecode.data",
+    "get_points_in_radius": "resourcecode.data",
+    "get_mesh_adjacency": "resourcecode.data",
+    "get_neighbours": "resourcecode.data",
+    "get_mesh_components": "resourcecode.data",
+    "get_shortest_path": "resourcecode.data",
+    "get_distance_to_coast": "resourcecode.data",
+    "get_grid_distance_to_coast": "resourcecode.data",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    else:
+        try:
+            value = importlib.import_module(f"{__name__}.{name}")
+        except ModuleNotFoundError as error:
+            if error.name != f"{__name__}.{name}":
+                raise
+            raise AttributeError(
+                f"module {__name__!r} has no attribute {name!r}"
+            ) from None
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+def to_netcdf(*args, **kwargs):
+    """See :py:func:`resourcecode.io.to_netcdf`"""
+    from resourcecode.io import to_netcdf
+
+    return to_netcdf(*args, **kwargs)
+
+
+def read_netcdf(*args, **kwargs):
+    """See :py:func:`resourcecode.io.read_netcdf`"""
+    from resourcecode.io import read_netcdf
+
+    return read_netcdf(*args, **kwargs)
+
 
 PandasObject.to_netcdf = to_netcdf
 pd.read_netcdf = read_netcdf
 
 
+class _PlotlyThemeLoader(importlib.abc.Loader):
+    """Load `plotly.io` with its own loader, then the resourcecode theme"""
+
+    def __init__(self, loader: importlib.abc.Loader):
+        self.loader = loader
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        self.loader.exec_module(module)
+        import resourcecode.plotly_theme  # noqa
+
+
+class _PlotlyThemeFinder(importlib.abc.MetaPathFinder):
+    """Set the resourcecode plotly theme as the default one as soon as
+    `plotly.io` is imported, without importing plotly beforehand."""
+
+    def find_spec(
+        self, fullname: str, path: Optional[Sequence[str]], target: Any = None
+    ):
+        if fullname != "plotly.io":
+            return None
+        sys.meta_path.remove(self)
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path, target)
+        if spec is not None and spec.loader is not None:
+            spec.loader = _PlotlyThemeLoader(spec.loader)
+        return spec
+
+
+# the resourcecode plotly theme is the default one of the figures. It is set
+# when plotly.io is imported, or now if it is already.
+if "plotly.io" in sys.modules:
+    import resourcecode.plotly_theme  # noqa
+elif not any(isinstance(finder, _PlotlyThemeFinder) for finder in sys.meta_path):
+    sys.meta_path.insert(0, _PlotlyThemeFinder())
+
+
 __all__ = [
     "__version__",
     "Client",
+    "AsyncClient",
     "get_coastline",
     "get_grid_field",
     "get_grid_spec",
@@ -56,4 +178,16 @@ __all__ = [
     "get_variables",
     "get_closest_station",
     "get_closest_point",
+    "get_closest_stations",
+    "get_closest_points",
+    "get_interpolation_weights",
+    "get_points_in_bbox",
+    "get_points_in_polygon",
+    "get_points_in_radius",
+    "get_mesh_adjacency",
+    "get_neighbours",
+    "get_mesh_components",
+    "get_shortest_path",
+    "get_distance_to_coast",
+    "get_grid_distance_to_coast",
 ]
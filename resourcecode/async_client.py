@@ -0,0 +1,241 @@
+# coding: utf-8
+
+# Copyright 2020-2022 IFREMER (Brest, FRANCE), all rights reserved.
+# contact -- mailto:nicolas.raillard@ifremer.fr
+#
+# This file is part of Resourcecode.
+#
+# Resourcecode is free software: you can redistribute it and/or modify it under
+# the terms of the GNU Lesser General Public License as published by the Free
+# Software Foundation, either version 3.0 of the License, or (at your option)
+# any later version.
+#
+# Resourcecode is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU Lesser General Public License for more
+# details.
+#
+# You should have received a copy of the GNU Lesser General Public License along
+# with Resourcecode. If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None  # type: ignore
+
+from resourcecode.exceptions import FetchError
+from resourcecode.client import (
+    BaseClient,
+    TimeseriesDecoder,
+    STREAM_CHUNK_SIZE,
+    _check_status,
+    _criteria_from_url,
+    _to_timestamp,
+)
+
+
+def _query_parameters(criteria: dict) -> List[Tuple[str, str]]:
+    """Encode the criteria as query parameters, the same way `requests` does:
+    lists are given as repeated parameters, and None values are dropped."""
+    query: List[Tuple[str, str]] = []
+    for key, value in criteria.items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        query.extend((key, str(v)) for v in values if v is not None)
+    return query
+
+
+class AsyncClient(BaseClient):
+    """Define an asynchronous client to query data from the cassandra database
+
+    This client has the same methods as :py:class:`resourcecode.Client`, but
+    they are coroutines, so that the queries do not block the event loop. It
+    requires the `aiohttp` package.
+
+    Example
+    -------
+
+    .. code-block:: python
+
+        from resourcecode import AsyncClient
+
+        async with AsyncClient() as client:
+            data = await client.get_dataframe(
+                pointId=42,
+                startDateTime="2017-01-01T00:53:20",
+                endDateTime="2017-03-19T07:06:40",
+                parameters=["hs", "fp"],
+            )
+
+    Parameters
+    ----------
+    max_workers: optional int
+        the maximum number of requests sent concurrently to the database.
+        If not given, the `max-workers` value of the configuration file is
+        used (default to 8).
+    compression: optional bool
+        whether to ask the database for gzip/deflate compressed responses. If
+        not given, the `compression` value of the configuration file is used
+        (default to True).
+    retries: optional int
+        the number of times a failed query is sent again to the database.
+        If not given, the `retries` value of the configuration file is used
+        (default to 3).
+    backoff_factor: optional float
+        the base delay between two attempts of a query, in seconds. If not
+        given, the `backoff-factor` value of the configuration file is used
+        (default to 0.5).
+    dtype: optional str
+        the dtype of the returned columns, see :py:class:`resourcecode.Client`.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        compression: Optional[bool] = None,
+        retries: Optional[int] = None,
+        backoff_factor: Optional[float] = None,
+        dtype: Optional[str] = None,
+    ):
+        if aiohttp is None:
+            raise ImportError("the AsyncClient requires the `aiohttp` package")
+
+        super().__init__(max_workers, retries, backoff_factor, dtype)
+
+        if compression is None:
+            compression = self.config.getboolean(
+                "default", "compression", fallback=True
+            )
+        self.compression = compression
+        self.session: Optional["aiohttp.ClientSession"] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close the connections opened to the database"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Get the HTTP session shared by all the queries of the client.
+
+        The session is created on first use, as it must be bound to the
+        running event loop.
+        """
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_workers),
+                headers={
+                    "Accept-Encoding": (
+                        "gzip, deflate" if self.compression else "identity"
+                    )
+                },
+            )
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        return self.session
+
+    async def get_dataframe(
+        self,
+        pointId: int,
+        startDateTime: Optional[Union[str, datetime, int]] = None,
+        endDateTime: Optional[Union[str, datetime, int]] = None,
+        parameters: Iterable[str] = ("hs",),
+    ) -> pd.DataFrame:
+        """Get a pandas dataframe of the data described by the criteria
+
+        See :py:meth:`resourcecode.Client.get_dataframe`.
+        """
+        criteria = {
+            "node": pointId,
+            "start": _to_timestamp(startDateTime),
+            "end": _to_timestamp(endDateTime),
+            "parameters": parameters,
+        }
+
+        return await self.get_dataframe_from_criteria(criteria)
+
+    async def get_dataframe_from_url(
+        self, selection_url: str, parameters: Iterable[str] = ("hs",)
+    ) -> pd.DataFrame:
+        """Get the pandas dataframe of the data described by the url
+
+        See :py:meth:`resourcecode.Client.get_dataframe_from_url`.
+        """
+        criteria = _criteria_from_url(selection_url, parameters)
+        return await self.get_dataframe_from_criteria(criteria)
+
+    async def get_dataframe_from_criteria(
+        self, criteria: Union[str, dict]
+    ) -> pd.DataFrame:
+        """return the pandas dataframe of the data described by the criteria
+
+        See :py:meth:`resourcecode.Client.get_dataframe_from_criteria`.
+        """
+        parsed_criteria = self._parse_criteria(criteria)
+        parameters = list(parsed_criteria.get("parameter", ()))
+        criteria_list = self._split_criteria(parsed_criteria)
+
+        parameter_arrays = await asyncio.gather(
+            *(
+                self._fetch_array_with_retries(single_parameter_criteria)
+                for single_parameter_criteria in criteria_list
+            ),
+            return_exceptions=True,
+        )
+        return self._build_dataframe(
+            parameters,
+            self._source_arrays(criteria_list, parameter_arrays),
+            self.dtype,
+        )
+
+    async def _fetch_array_with_retries(
+        self, single_parameter_criteria: dict
+    ) -> np.ndarray:
+        """return the time history of the data described by the parameters,
+        fetched from the database.
+
+        See :py:meth:`resourcecode.Client._fetch_array_with_retries`.
+        """
+        attempt = 0
+        while True:
+            try:
+                array = await self._fetch_array(single_parameter_criteria)
+                self._check_result(single_parameter_criteria, array)
+                return array
+            except (aiohttp.ClientError, asyncio.TimeoutError, FetchError) as failure:
+                if not getattr(failure, "retryable", True) or attempt >= self.retries:
+                    raise
+                attempt += 1
+                await asyncio.sleep(self._retry_delay(attempt))
+
+    async def _fetch_array(self, single_parameter_criteria: dict) -> np.ndarray:
+        """return the time history of the data described by the parameters,
+        fetched from the database.
+
+        The response is decoded while it is downloaded, and at most
+        `max_workers` queries are sent at the same time.
+        """
+        session = self._get_session()
+        assert self._semaphore is not None
+        async with self._semaphore:
+            async with session.get(
+                self.timeseries_url, params=_query_parameters(single_parameter_criteria)
+            ) as response:
+                _check_status(response.ok, response.status)
+
+                decoder = TimeseriesDecoder()
+                async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    decoder.feed(chunk)
+                return decoder.result()
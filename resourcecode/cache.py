@@ -0,0 +1,311 @@
+# coding: utf-8
+
+# Copyright 2020-2022 IFREMER (Brest, FRANCE), all rights reserved.
+# contact -- mailto:nicolas.raillard@ifremer.fr
+#
+# This file is part of Resourcecode.
+#
+# Resourcecode is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3.0 of the License, or any later version.
+#
+# Resourcecode is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along
+# with Resourcecode. If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import json
+import time
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from resourcecode.utils import LOGGER
+
+# the hindcast time step, in milliseconds
+TIME_STEP_MS = 3600e3
+
+Interval = Tuple[float, float]
+
+
+def _fill_missing_times(times: np.ndarray) -> np.ndarray:
+    """Return a copy of `times` where the missing (NaN) timestamps are deduced
+    from their position in the series.
+
+    The database does not give the timestamp of a record when its value is
+    null. Those records are however in chronological order, so their
+    timestamps can be inferred from the known ones.
+    """
+
+    missing = np.isnan(times)
+    if not missing.any():
+        return times
+
+    known = np.flatnonzero(~missing)
+    if known.size == 0:
+        return times
+
+    if known.size == 1:
+        step = TIME_STEP_MS
+    else:
+        step = (times[known[-1]] - times[known[0]]) / (known[-1] - known[0])
+
+    positions = np.arange(len(times))
+    filled = np.interp(positions, known, times[known])
+    before, after = positions < known[0], positions > known[-1]
+    filled[before] = times[known[0]] - (known[0] - positions[before]) * step
+    filled[after] = times[known[-1]] + (positions[after] - known[-1]) * step
+    return filled
+
+
+def _merge_intervals(intervals: List[Interval]) -> List[Interval]:
+    """Merge the overlapping or contiguous intervals
+
+    The bounds are inclusive integer seconds, so two intervals are only
+    contiguous when the second one starts at most one second after the end of
+    the first one.
+    """
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _subtract_intervals(
+    start: float, end: float, intervals: List[Interval]
+) -> List[Interval]:
+    """Return the parts of the [start, end] interval not covered by the
+    `intervals`"""
+    gaps: List[Interval] = []
+    for interval_start, interval_end in _merge_intervals(intervals):
+        if interval_end < start or interval_start > end:
+            continue
+        if interval_start > start:
+            gaps.append((start, interval_start - 1))
+        start = max(start, interval_end + 1)
+    if start <= end:
+        gaps.append((start, end))
+    return gaps
+
+
+def merge_series(
+    arrays: List[np.ndarray], filled_times: Optional[List[np.ndarray]] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Merge several time series, as returned by the database, into a single
+    chronological one.
+
+    When a record is found in several time series, the last one is kept.
+
+    Parameters
+    ----------
+    arrays:
+        the time series to merge. Each of them is a 2D array: the first column
+        is the timestamp in milliseconds, the second one the value.
+    filled_times:
+        the timestamps of each time series, where the missing ones have been
+        filled. If not given, they are deduced from the arrays.
+
+    Returns
+    -------
+    (array, filled_time)
+        the merged time series, and its timestamps where the missing ones have
+        been filled.
+    """
+    if filled_times is None:
+        filled_times = [_fill_missing_times(array[:, 0]) for array in arrays]
+
+    arrays = [array.reshape(-1, 2) for array in arrays]
+    array = np.concatenate(arrays)
+    times = np.concatenate(filled_times)
+
+    # np.unique keeps the first occurrence, so look for them in reverse order.
+    _, reversed_indices = np.unique(times[::-1], return_index=True)
+    indices = len(times) - 1 - reversed_indices
+    return array[indices], times[indices]
+
+
+class TimeseriesCache:
+    """On-disk cache of the time series returned by the Cassandra database.
+
+    Each time series is stored in its own Parquet file, keyed by node and
+    parameter, along with the time intervals it covers. When the total size
+    of the cache exceeds `max_size`, the least recently used files are removed.
+
+    Parameters
+    ----------
+    directory: str or Path
+        the directory where the time series are stored.
+    max_size: int
+        the maximum size of the cache, in bytes.
+    """
+
+    def __init__(self, directory: Union[str, Path], max_size: int):
+        self.directory = Path(directory).expanduser()
+        self.max_size = max_size
+        self._lock = threading.RLock()
+        # the last access time and the size of each cached file, read from
+        # the directory on first use, then kept up to date by the cache
+        self._files: Optional[Dict[Path, Tuple[int, int]]] = None
+        self._size = 0
+
+    def _path(self, node: int, parameter: str) -> Path:
+        return self.directory / parameter / f"{node}.parquet"
+
+    def _read(self, path: Path) -> Tuple[np.ndarray, np.ndarray, List[Interval]]:
+        table = pq.read_table(path)
+        intervals = json.loads(table.schema.metadata[b"intervals"])
+        array = np.column_stack(
+            (
+                table.column("time").to_numpy(),
+                table.column("value").to_numpy(),
+            )
+        )
+        filled_time = table.column("filled_time").to_numpy()
+        return array, filled_time, [tuple(interval) for interval in intervals]
+
+    def _write(
+        self,
+        path: Path,
+        array: np.ndarray,
+        filled_time: np.ndarray,
+        intervals: List[Interval],
+    ):
+        table = pa.table(
+            {"time": array[:, 0], "value": array[:, 1], "filled_time": filled_time}
+        )
+        table = table.replace_schema_metadata({"intervals": json.dumps(intervals)})
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # unique to the thread and the process, as the directory can be shared
+        temporary_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        pq.write_table(table, temporary_path)
+        os.replace(temporary_path, path)
+        if self._files is not None:
+            size = path.stat().st_size
+            self._size += size - self._files.get(path, (0, 0))[1]
+            self._files[path] = (0, size)
+        self._touch(path)
+
+    def _touch(self, path: Path):
+        """Mark the file as recently used.
+
+        The modification time is set explicitly, as the file system may not
+        update it precisely enough to order consecutive accesses.
+        """
+        now = time.time_ns()
+        os.utime(path, ns=(now, now))
+        if self._files is not None and path in self._files:
+            self._files[path] = (now, self._files[path][1])
+
+    def _scan(self):
+        """Read the last access time and the size of the cached files"""
+        self._files = {}
+        for path in self.directory.glob("*/*.parquet"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # removed by another process
+                continue
+            self._files[path] = (stat.st_mtime_ns, stat.st_size)
+        self._size = sum(size for _, size in self._files.values())
+
+    def lookup(
+        self, node: int, parameter: str, start: float, end: float
+    ) -> Tuple[np.ndarray, List[Interval]]:
+        """Return the cached part of the time series of `parameter` at `node`,
+        between the `start` and `end` timestamps (in seconds), and the time
+        intervals missing from the cache.
+
+        The returned array has the same layout as the database response: the
+        first column is the timestamp in milliseconds, the second one the
+        value of the parameter.
+        """
+
+        path = self._path(node, parameter)
+        with self._lock:
+            if not path.exists():
+                return np.empty((0, 2)), [(start, end)]
+            array, times, intervals = self._read(path)
+            self._touch(path)
+
+        gaps = _subtract_intervals(start, end, intervals)
+        LOGGER.debug(
+            "cache lookup for %s at node %s: %d missing interval(s)",
+            parameter,
+            node,
+            len(gaps),
+        )
+        return array[(times >= start * 1e3) & (times <= end * 1e3)], gaps
+
+    def get(
+        self, node: int, parameter: str, start: float, end: float
+    ) -> Optional[np.ndarray]:
+        """Return the cached time series of `parameter` at `node`, between the
+        `start` and `end` timestamps (in seconds), or None if this time range
+        is not (entirely) in the cache.
+        """
+        array, gaps = self.lookup(node, parameter, start, end)
+        if gaps:
+            return None
+        return array
+
+    def put(
+        self, node: int, parameter: str, start: float, end: float, array: np.ndarray
+    ):
+        """Store the time series of `parameter` at `node`, covering the time
+        range between the `start` and `end` timestamps (in seconds)."""
+
+        if array.size == 0 or np.isnan(array[:, 0]).all():
+            return
+
+        path = self._path(node, parameter)
+        intervals = [(start, end)]
+        times = _fill_missing_times(array[:, 0])
+        with self._lock:
+            if path.exists():
+                cached_array, cached_times, cached_intervals = self._read(path)
+                # the freshly fetched records replace the cached ones
+                array, times = merge_series(
+                    [cached_array, array], [cached_times, times]
+                )
+                intervals += cached_intervals
+            self._write(path, array, times, _merge_intervals(intervals))
+            self._evict()
+
+    def _evict(self):
+        """Remove the least recently used files until the cache size is below
+        the maximum size.
+
+        The files are listed once, then tracked as they are written, read and
+        removed, so that the directory is not scanned at each update.
+        """
+        if self._files is None:
+            self._scan()
+        assert self._files is not None
+        if self._size <= self.max_size:
+            return
+
+        for path, (_, size) in sorted(self._files.items(), key=lambda item: item[1]):
+            if self._size <= self.max_size:
+                break
+            LOGGER.info("evicting %s from the cache", path)
+            path.unlink(missing_ok=True)
+            del self._files[path]
+            self._size -= size
+
+    def clear(self):
+        """Remove all the cached time series"""
+        with self._lock:
+            for path in self.directory.glob("*/*.parquet"):
+                path.unlink()
+            self._files = {}
+            self._size = 0
@@ -19,22 +19,628 @@
 # You should have received a copy of the GNU Lesser General Public License along
 # with Resourcecode. If not, see <https://www.gnu.org/licenses/>.
 
+import re
 import sys
 import json
+import time
+import numbers
+import random
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from urllib.parse import urljoin, urlparse, parse_qs, unquote_plus
 from datetime import datetime
-from typing import Iterable, Union, Optional
+from pathlib import Path
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Tuple,
+    Union,
+    Optional,
+)
+
+from functools import lru_cache, partial
 
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
+import pyarrow as pa
+from pandas.tseries.frequencies import to_offset
 import numpy as np
 
-from resourcecode.utils import get_config
-from resourcecode.data import get_variables, get_grid_field
-from resourcecode.exceptions import BadParameterError, BadPointIdError
+from resourcecode.cache import TimeseriesCache, merge_series
+from resourcecode.derived import DERIVED_PARAMETERS, get_sources
+from resourcecode.dtypes import DTYPES, build_dataframe, build_table
+from resourcecode.scheduler import RequestScheduler, INTERACTIVE, BATCH
+from resourcecode.utils import get_config, clear_config_cache, LOGGER
+from resourcecode.data import (
+    get_variables,
+    get_grid_field,
+    get_covered_period,
+    get_interpolation_weights,
+)
+from resourcecode.exceptions import BadParameterError, BadPointIdError, FetchError
+
+# default number of requests sent concurrently to the cassandra database
+DEFAULT_MAX_WORKERS = 8
+
+# default maximum size of the time series cache, in megabytes
+DEFAULT_CACHE_MAX_SIZE = 1024
+
+# size of the chunks read from the database responses, in bytes
+STREAM_CHUNK_SIZE = 2**20
+
+# default maximum number of queries sent to the database per second (0: the
+# queries are not rate limited)
+DEFAULT_RATE_LIMIT = 0
+
+# default number of times a failed query is sent again to the database
+DEFAULT_RETRIES = 3
+
+# default base delay between two attempts of a query, in seconds
+DEFAULT_BACKOFF_FACTOR = 0.5
+
+# the HTTP status codes of the responses worth retrying
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# the parameters that are directions (in degrees), interpolated as angles
+DIRECTION_PARAMETERS = re.compile(r"^(dir|dp|mssd|wdir|cdir|pdir\d|pdp\d)$")
+
+
+@lru_cache(maxsize=None)
+def _get_possible_parameters() -> FrozenSet[str]:
+    return frozenset(get_variables().name)
+
+
+@lru_cache(maxsize=None)
+def _get_possible_points_id() -> FrozenSet[int]:
+    return frozenset(get_grid_field().node)
+
+
+def clear_metadata_cache():
+    """Forget the configuration and the lists of parameters and points cached
+    by the clients.
+
+    They are read once per process, when the first client is created: call
+    this function after editing the configuration file, so that the next
+    clients read it again.
+    """
+    clear_config_cache()
+    _get_possible_parameters.cache_clear()
+    _get_possible_points_id.cache_clear()
+
+
+def _to_timestamp(date: Optional[Union[str, datetime, int]] = None) -> Optional[int]:
+    """Convert a date (datetime or string in isoformat) to a timestamp"""
+    if isinstance(date, str):
+        date = datetime.fromisoformat(date)
+    if isinstance(date, datetime):
+        date = int(date.timestamp())
+    return date
+
+
+def _criteria_key(single_parameter_criteria: dict) -> str:
+    """Return a key identifying the query of the criteria. The integral start
+    and end timestamps are written as integers, whether they are given as
+    integers or as floats."""
+    normalized_criteria = dict(single_parameter_criteria)
+    for bound in ("start", "end"):
+        value = normalized_criteria.get(bound)
+        if isinstance(value, numbers.Real) and float(value).is_integer():
+            normalized_criteria[bound] = int(float(value))
+    return json.dumps(normalized_criteria, sort_keys=True)
+
+
+def _interpolate(dataframes: List[pd.DataFrame], weights: np.ndarray) -> pd.DataFrame:
+    """Return the weighted sum of the dataframes, on the union of their
+    indexes. The directions are summed as unit vectors. A value is NaN if it
+    is missing from one of the dataframes."""
+    index = dataframes[0].index
+    if not all(dataframe.index.equals(index) for dataframe in dataframes[1:]):
+        # the records without timestamp can not be aligned: they are dropped.
+        dataframes = [dataframe[dataframe.index.notna()] for dataframe in dataframes]
+        for dataframe in dataframes:
+            index = index.union(dataframe.index)
+        index = index.dropna()
+        dataframes = [dataframe.reindex(index) for dataframe in dataframes]
+
+    interpolated = {}
+    for column in dataframes[0].columns:
+        values = np.stack([dataframe[column].to_numpy() for dataframe in dataframes])
+        if DIRECTION_PARAMETERS.match(column):
+            angles = np.radians(values)
+            interpolated[column] = (
+                np.degrees(
+                    np.arctan2(weights @ np.sin(angles), weights @ np.cos(angles))
+                )
+                % 360
+            )
+        else:
+            interpolated[column] = weights @ values
+    return pd.DataFrame(interpolated, index=index)
+
+
+def _check_status(ok: bool, status_code: int):
+    """Raise a FetchError if the database response is not successful"""
+    if not ok:
+        raise FetchError(
+            "Unable to get a response from the database"
+            "(status code = {})".format(status_code),
+            retryable=status_code in RETRYABLE_STATUS_CODES,
+        )
+
+
+def _split_time_range(
+    start: float, end: float, frequency: Optional[str] = None
+) -> List[Tuple[float, float]]:
+    """Split the [start, end] time range (timestamps in seconds) into
+    consecutive windows, whose bounds follow the given pandas frequency
+    (for instance "YS" to split the time range by calendar year)."""
+
+    if not frequency:
+        return [(start, end)]
+
+    boundaries = pd.date_range(
+        pd.to_datetime(start, unit="s"), pd.to_datetime(end, unit="s"), freq=frequency
+    )
+    starts = [start]
+    starts += [int(b) for b in boundaries.asi8 // 10**9 if start < b <= end]
+    ends = [s - 1 for s in starts[1:]] + [end]
+    return list(zip(starts, ends))
+
+
+def _criteria_from_url(selection_url: str, parameters: Iterable[str]) -> dict:
+    """Get the criteria described by the url of a selection in the resource
+    code web application"""
+
+    search_parameters = parse_qs(urlparse(unquote_plus(selection_url)).query)
+    if not search_parameters:
+        raise ValueError("no criteria found in the url")
+
+    criteria = {
+        "node": int(search_parameters["pointId"][0]),
+        "parameter": parameters,
+    }
+
+    if "startDateTime" in search_parameters:
+        start = search_parameters["startDateTime"][0].rstrip("Z")
+        criteria["start"] = int(datetime.fromisoformat(start).timestamp())
+
+    if "endDateTime" in search_parameters:
+        end = search_parameters["endDateTime"][0].rstrip("Z")
+        criteria["end"] = int(datetime.fromisoformat(end).timestamp())
+
+    return criteria
+
+
+class TimeseriesDecoder:
+    """Incrementally decode the json returned by the cassandra database.
+
+    The response is fed chunk by chunk, and the records of the time series
+    are directly written into a 2D array, preallocated from the
+    `dataSetSize` announced by the database. This avoids building the
+    whole json document as Python objects.
+
+    Example
+    -------
+
+    .. code-block:: python
+
+        decoder = TimeseriesDecoder()
+        for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+            decoder.feed(chunk)
+        array = decoder.result()
+    """
+
+    _DATASET_SIZE = re.compile(rb'"dataSetSize"\s*:\s*(\d+)')
+    _DATA_START = re.compile(rb'"data"\s*:\s*\[')
+    _EMPTY_DATA_END = re.compile(rb"\s*\]")
+    _DATA_END = re.compile(rb"\]\s*\]")
+
+    def __init__(self):
+        self._buffer = b""
+        self._in_data = False
+        self._done = False
+        self._array = np.empty((0, 2))
+        self._size = 0
+
+    def feed(self, chunk: bytes):
+        """Decode a new chunk of the response"""
+        if self._done:
+            return
+
+        self._buffer += chunk
+        if not self._in_data:
+            data_start = self._DATA_START.search(self._buffer)
+            if data_start is None:
+                return
+            dataset_size = self._DATASET_SIZE.search(
+                self._buffer, 0, data_start.start()
+            )
+            if dataset_size is not None:
+                self._array = np.empty((int(dataset_size.group(1)), 2))
+            self._buffer = self._buffer[data_start.end() :]
+            self._in_data = True
+
+        if self._EMPTY_DATA_END.match(self._buffer):
+            self._done = True
+            return
+
+        data_end = self._DATA_END.search(self._buffer)
+        if data_end is not None:
+            self._done = True
+            records = self._buffer[: data_end.start() + 1]
+        else:
+            # only decode the complete records, and keep the rest for later
+            last_record_end = self._buffer.rfind(b"]")
+            if last_record_end < 0:
+                return
+            records = self._buffer[: last_record_end + 1]
+        self._buffer = self._buffer[len(records) :]
+        self._append(records)
+
+    def _append(self, records: bytes):
+        """Write the records (like `[t0,v0],[t1,v1]`) into the array"""
+        text = records.translate(None, b"[] \t\r\n").replace(b"null", b"nan")
+        text = text.strip(b",")
+        if not text:
+            return
+
+        values = np.fromstring(text.decode("ascii"), sep=",")
+        if values.size != text.count(b",") + 1 or values.size % 2:
+            raise ValueError("Unable to decode the response of the database")
+
+        n_records = values.size // 2
+        if self._size + n_records > len(self._array):
+            # the database did not announce the right dataSetSize
+            array = np.empty((max(2 * len(self._array), self._size + n_records), 2))
+            array[: self._size] = self._array[: self._size]
+            self._array = array
+        self._array[self._size : self._size + n_records] = values.reshape(-1, 2)
+        self._size += n_records
+
+    def result(self) -> np.ndarray:
+        """Return the decoded time series.
+
+        It's a 2D array. The first columns is the timestamp (in milliseconds),
+        the second one the value of the parameter at the corresponding
+        timestamps.
+        """
+        if not self._done:
+            raise ValueError("The response of the database is incomplete")
+        return self._array[: self._size]
+
+
+class BaseClient:
+    """The part of the clients common to the synchronous and asynchronous
+    implementations: the configuration, the checking of the criteria, and the
+    building of the dataframes."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        retries: Optional[int] = None,
+        backoff_factor: Optional[float] = None,
+        dtype: Optional[str] = None,
+    ):
+        self.config = get_config()
+        self.possible_parameters = _get_possible_parameters()
+        self.possible_points_id = _get_possible_points_id()
+
+        if max_workers is None:
+            max_workers = self.config.getint(
+                "default", "max-workers", fallback=DEFAULT_MAX_WORKERS
+            )
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+        self.max_workers = max_workers
+
+        if retries is None:
+            retries = self.config.getint("default", "retries", fallback=DEFAULT_RETRIES)
+        if retries < 0:
+            raise ValueError(f"retries must be positive, got {retries}")
+        self.retries = retries
+
+        if backoff_factor is None:
+            backoff_factor = self.config.getfloat(
+                "default", "backoff-factor", fallback=DEFAULT_BACKOFF_FACTOR
+            )
+        self.backoff_factor = backoff_factor
+
+        if dtype is None:
+            dtype = self.config.get("default", "dtype", fallback="float64")
+        if dtype not in DTYPES:
+            raise ValueError(f"dtype must be one of {', '.join(DTYPES)}, got {dtype!r}")
+        self.dtype = dtype
+
+    @property
+    def cassandra_base_url(self):
+        return self.config.get("default", "cassandra-base-url")
+
+    @property
+    def timeseries_url(self):
+        return urljoin(self.cassandra_base_url, "api/timeseries")
+
+    def _parse_criteria(self, criteria: Union[str, dict]) -> dict:
+        """Parse and check the criteria.
+
+        The missing dates are replaced by the default ones, and the node
+        is converted to the Cassandra indexing.
+
+        Raises
+        ------
+        BadParameterError
+            if a parameter is unknown.
+        BadPointIdError
+            if the node is unknown.
+        """
+        min_date = self.config.get("default", "min-start-date")
+        max_date = datetime.today().isoformat()
+        default_criteria = {
+            "node": 1,
+            "start": int(datetime.fromisoformat(min_date).timestamp()),
+            "end": int(datetime.fromisoformat(max_date).timestamp()),
+        }
+
+        if isinstance(criteria, str):
+            parsed_criteria = json.loads(criteria)
+        else:
+            parsed_criteria = criteria
+
+        # make sure compulsory parameters are present (node, dates) and are not
+        # None.
+        parsed_criteria = {
+            **default_criteria,
+            **{
+                key: value
+                for key, value in parsed_criteria.items()
+                if value is not None
+            },
+        }
+
+        if "parameters" in parsed_criteria:
+            # let's tolerate `parameter` and `parameters`
+            parsed_criteria["parameter"] = parsed_criteria["parameters"]
+
+        parameters = parsed_criteria.get("parameter", ())
+        unknown_parameters = (
+            set(parameters) - self.possible_parameters - set(DERIVED_PARAMETERS)
+        )
+        if unknown_parameters:
+            raise BadParameterError(
+                f"{','.join(unknown_parameters)} parameter(s) is/are unknown. "
+                "Please have to look to `resourcecode.data.get_variables()`, "
+                "to get the accepted parameters."
+            )
+
+        try:
+            node_id = int(parsed_criteria["node"])
+        except ValueError:  # failed to convert node to an integer
+            raise BadPointIdError(
+                "Point Id must be an integer, can not be "
+                f"{parsed_criteria['node']!r}"
+            )
+        else:
+            if node_id not in self.possible_points_id:
+                raise BadPointIdError(
+                    f"{parsed_criteria['node']} is an unknown pointId."
+                )
+
+        # Cassandra database start indexing at 1, so decrement node. The
+        # validated int is kept, so that NumPy integers are accepted.
+        parsed_criteria["node"] = node_id - 1
+
+        return parsed_criteria
+
+    def _split_criteria(self, parsed_criteria: dict) -> List[dict]:
+        """Split the criteria into one criteria per parameter of the database.
+
+        We assume that multiple parameters can be given. For each parameter
+        of the database needed to get them, we make a query and we concatenate
+        all the responses. The derived parameters (like tp, which is equal to
+        1/fp) are replaced by the parameters they are computed from, and each
+        parameter is queried once. The criteria of a parameter do not depend
+        on the other requested parameters, so that identical queries can be
+        coalesced.
+        """
+        criteria = {
+            key: value for key, value in parsed_criteria.items() if key != "parameters"
+        }
+        return [
+            {**criteria, "parameter": [source]}
+            for source in get_sources(
+                parameter.lower() for parameter in parsed_criteria.get("parameter", ())
+            )
+        ]
+
+    @staticmethod
+    def _source_arrays(criteria_list: List[dict], arrays: Iterable) -> dict:
+        """Map the parameter of each criteria to its fetched time history"""
+        return {
+            criteria["parameter"][0]: array
+            for criteria, array in zip(criteria_list, arrays)
+        }
+
+    def _retry_delay(self, attempt: int) -> float:
+        """Return the delay before the given attempt of a query (starting at
+        1 for the first retry), in seconds.
+
+        The delay grows exponentially with the attempts, and is drawn at random
+        ("full jitter") so that the concurrent queries that failed together are
+        not sent again all at once.
+        """
+        return random.uniform(0, self.backoff_factor * 2 ** (attempt - 1))
+
+    @staticmethod
+    def _is_in_covered_period(single_parameter_criteria: dict) -> bool:
+        """Whether the time range of the criteria overlaps the hindcast period.
+
+        The database is expected to return some data for such a time range: an
+        empty response is then considered as a transient failure.
+        """
+        covered_period = get_covered_period()
+        return (
+            single_parameter_criteria["start"] <= covered_period["end"].timestamp()
+            and single_parameter_criteria["end"] >= covered_period["start"].timestamp()
+        )
+
+    def _check_result(self, single_parameter_criteria: dict, array: np.ndarray):
+        """Raise a FetchError if the database returned no data where some
+        were expected."""
+        if array.size == 0 and self._is_in_covered_period(single_parameter_criteria):
+            raise FetchError("the database returned no data", retryable=True)
+
+    @staticmethod
+    def _compute_columns(
+        parameters: Iterable[str],
+        source_arrays: Dict[str, Union[np.ndarray, BaseException]],
+    ) -> Optional[
+        Tuple[List[str], List[np.ndarray], np.ndarray, Dict[str, BaseException]]
+    ]:
+        """Compute the values of the parameters, from the time history of the
+        parameters of the database they are computed from.
 
+        The derived parameters (see `resourcecode.derived`) are computed from
+        the time history of their sources.
 
-class Client:
+        A parameter whose sources could not be fetched (an exception is given
+        in place of their array) is left out, and reported in the returned
+        errors. If all the parameters failed, the first exception is raised.
+
+        The time histories are not modified, as they may be shared by several
+        parameters or several callers.
+
+        Result
+        ------
+        (columns, values, time, errors)
+            the parameters that succeeded, their values, the timestamps of the
+            records (in milliseconds), and the exceptions of the parameters
+            that failed. None if the database returned no data.
+        """
+        index_array = None
+        values = []
+        columns = []
+        errors: Dict[str, BaseException] = {}
+        for parameter in parameters:
+            derived_parameter = DERIVED_PARAMETERS.get(parameter.lower())
+            sources = (
+                derived_parameter.sources if derived_parameter else [parameter.lower()]
+            )
+            arrays: List[np.ndarray] = []
+            for source in sources:
+                source_array = source_arrays[source]
+                if isinstance(source_array, BaseException):
+                    errors[parameter] = source_array
+                    break
+                arrays.append(source_array)
+            if parameter in errors:
+                continue
+
+            # each array is the time history of a parameter of the database.
+            # it's a 2D array. The first columns is the timestamp, the second
+            # one the value of this parameters at the corresponding timestamps.
+            if any(array.size == 0 for array in arrays):
+                print(
+                    "It appears the API failed to returned the expected values. "
+                    "You may try to recall the function in a few moment.",
+                    file=sys.stderr,
+                )
+                return None
+
+            if derived_parameter:
+                values.append(
+                    derived_parameter.function(*(array[:, 1] for array in arrays))
+                )
+            else:
+                values.append(arrays[0][:, 1])
+            columns.append(parameter)
+
+            for array in arrays:
+                if index_array is None:
+                    index_array = array[:, 0].copy()
+                    mask_index_nan = np.isnan(index_array)
+
+                # the index may be incomplete in some cases (when the variable
+                # is NaN).
+                # let's try to have the more complete index as possible, as the
+                # index should be the same for all the variable
+
+                if mask_index_nan.any():
+                    index_array[mask_index_nan] = array[mask_index_nan, 0]
+                    mask_index_nan = np.isnan(index_array)
+
+        if index_array is None and errors:
+            raise next(iter(errors.values()))
+        if index_array is None:
+            raise ValueError("no selection parameter found")
+
+        for parameter, error in errors.items():
+            LOGGER.warning("failed to get the parameter %s: %s", parameter, error)
+
+        return columns, values, index_array, errors
+
+    @classmethod
+    def _build_dataframe(
+        cls,
+        parameters: Iterable[str],
+        source_arrays: Dict[str, Union[np.ndarray, BaseException]],
+        dtype: str = "float64",
+    ) -> pd.DataFrame:
+        """Build the dataframe of the parameters, from the time history of the
+        parameters of the database they are computed from (see
+        `_compute_columns`).
+
+        The parameters that failed are reported in the `errors` attribute of
+        the dataframe. The values are converted to `dtype`, see
+        :py:func:`resourcecode.dtypes.build_dataframe`.
+        """
+        result = cls._compute_columns(parameters, source_arrays)
+        if result is None:
+            return pd.DataFrame()
+
+        columns, values, index_array, errors = result
+        dataframe = build_dataframe(
+            columns,
+            values,
+            pd.to_datetime(index_array.astype(np.int64), unit="ms"),
+            dtype,
+        )
+        dataframe.attrs["errors"] = errors
+        return dataframe
+
+    @classmethod
+    def _build_table(
+        cls,
+        parameters: Iterable[str],
+        source_arrays: Dict[str, Union[np.ndarray, BaseException]],
+        dtype: str = "float64",
+    ) -> pa.Table:
+        """Build the Arrow table of the parameters, from the time history of
+        the parameters of the database they are computed from (see
+        `_compute_columns`).
+
+        The parameters that failed are reported in the `errors` metadata of
+        the table. The values are converted to `dtype`, see
+        :py:func:`resourcecode.dtypes.build_table`.
+        """
+        result = cls._compute_columns(parameters, source_arrays)
+        if result is None:
+            return pa.table({})
+
+        columns, values, index_array, errors = result
+        table = build_table(columns, values, index_array, dtype)
+        metadata = {
+            **(table.schema.metadata or {}),
+            b"errors": json.dumps(
+                {parameter: str(error) for parameter, error in errors.items()}
+            ),
+        }
+        return table.replace_schema_metadata(metadata)
+
+
+class Client(BaseClient):
     """Define a client to query data from the cassandra database
 
     Example
@@ -54,16 +660,155 @@ class Client:
         ...     parameters=["hs", "fp"],
         ... )
         >>>
+
+    Parameters
+    ----------
+    max_workers: optional int
+        the maximum number of requests sent concurrently to the database.
+        If not given, the `max-workers` value of the configuration file is
+        used (default to 8). Use 1 to fetch the parameters sequentially.
+    pool_size: optional int
+        the number of connections kept alive to the database. If not given,
+        the `pool-size` value of the configuration file is used (default to
+        `max_workers`).
+    compression: optional bool
+        whether to ask the database for gzip/deflate compressed responses. If
+        not given, the `compression` value of the configuration file is used
+        (default to True).
+    cache_dir: optional str or Path
+        the directory where the downloaded time series are cached. If not
+        given, the `cache-dir` value of the configuration file is used. If
+        neither is set, the time series are not cached.
+    cache_max_size: optional int
+        the maximum size of the cache, in megabytes. If not given, the
+        `cache-max-size` value of the configuration file is used (default to
+        1024). The least recently used time series are removed from the
+        cache when it gets bigger.
+    chunk_frequency: optional str
+        a pandas frequency (for instance "YS" for each year, or "90D") used to
+        split long time ranges into several smaller queries, fetched
+        concurrently. If not given, the `chunk-frequency` value of the
+        configuration file is used. If neither is set, the time ranges are
+        not split.
+    retries: optional int
+        the number of times a failed query is sent again to the database
+        (on connection errors, server errors, or empty responses within the
+        hindcast period). If not given, the `retries` value of the
+        configuration file is used (default to 3).
+    backoff_factor: optional float
+        the base delay between two attempts of a query, in seconds. The n-th
+        retry waits a random delay up to `backoff_factor * 2 ** (n - 1)`. If
+        not given, the `backoff-factor` value of the configuration file is
+        used (default to 0.5).
+    dtype: optional str
+        the dtype of the returned columns: "float64", "float32" (half the
+        memory, the hindcast precision is kept), or "int16" to get the
+        parameters packed as in the hindcast files, in nullable Int16 columns
+        (see :py:func:`resourcecode.dtypes.unpack`). If not given, the `dtype`
+        value of the configuration file is used (default to "float64").
+    rate_limit: optional float
+        the maximum number of queries sent to the database per second, by all
+        the threads using the client. If not given, the `rate-limit` value of
+        the configuration file is used (default to 0, which disables the rate
+        limiting).
+    max_connections: optional int
+        the maximum number of queries running at the same time, by all the
+        threads using the client. If not given, the `max-connections` value of
+        the configuration file is used (default to `pool_size`).
+
+    The queries waiting for their turn are served by priority: the ones of
+    `get_dataframe` are sent before the queued ones of the batch extractions
+    of `get_dataframes`.
+
+    A parameter that still fails after the retries is left out of the
+    returned dataframe, and reported in its `attrs["errors"]` dictionnary,
+    whose keys are the parameters and values the corresponding exceptions.
+
+    The client keeps a pool of HTTP connections opened to the database, that
+    is reused by all the queries. It can be used as a context manager to close
+    these connections once the client is no longer needed.
     """
 
-    def __init__(self):
-        self.config = get_config()
-        self.possible_parameters = set(get_variables().name)
-        self.possible_points_id = set(get_grid_field().node)
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        pool_size: Optional[int] = None,
+        compression: Optional[bool] = None,
+        cache_dir: Optional[Union[str, Path]] = None,
+        cache_max_size: Optional[int] = None,
+        chunk_frequency: Optional[str] = None,
+        retries: Optional[int] = None,
+        backoff_factor: Optional[float] = None,
+        dtype: Optional[str] = None,
+        rate_limit: Optional[float] = None,
+        max_connections: Optional[int] = None,
+    ):
+        super().__init__(max_workers, retries, backoff_factor, dtype)
 
-    @property
-    def cassandra_base_url(self):
-        return self.config.get("default", "cassandra-base-url")
+        if pool_size is None:
+            pool_size = self.config.getint(
+                "default", "pool-size", fallback=self.max_workers
+            )
+        if compression is None:
+            compression = self.config.getboolean(
+                "default", "compression", fallback=True
+            )
+        self.session = self._create_session(pool_size, compression)
+
+        if rate_limit is None:
+            rate_limit = self.config.getfloat(
+                "default", "rate-limit", fallback=DEFAULT_RATE_LIMIT
+            )
+        if max_connections is None:
+            max_connections = self.config.getint(
+                "default", "max-connections", fallback=pool_size
+            )
+        self.scheduler = RequestScheduler(rate_limit, max_connections)
+
+        # the queries being sent, shared by the threads asking for the same
+        # data.
+        self._in_flight: Dict[str, Future] = {}
+        self._in_flight_lock = threading.Lock()
+
+        if cache_dir is None:
+            cache_dir = self.config.get("default", "cache-dir", fallback="")
+        if cache_max_size is None:
+            cache_max_size = self.config.getint(
+                "default", "cache-max-size", fallback=DEFAULT_CACHE_MAX_SIZE
+            )
+        self.cache = (
+            TimeseriesCache(cache_dir, cache_max_size * 2**20) if cache_dir else None
+        )
+
+        if chunk_frequency is None:
+            chunk_frequency = self.config.get("default", "chunk-frequency", fallback="")
+        if chunk_frequency:
+            # fail early on invalid frequencies
+            to_offset(chunk_frequency)
+        self.chunk_frequency = chunk_frequency
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Close the connections opened to the database"""
+        self.session.close()
+
+    @staticmethod
+    def _create_session(pool_size: int, compression: bool) -> requests.Session:
+        """Create the HTTP session shared by all the queries of the client"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["Connection"] = "keep-alive"
+        session.headers["Accept-Encoding"] = (
+            "gzip, deflate" if compression else "identity"
+        )
+        return session
 
     def get_dataframe(
         self,
@@ -95,20 +840,10 @@ class Client:
         `endDateTime`, and with one column per parameter.
         """
 
-        if isinstance(startDateTime, str):
-            startDateTime = datetime.fromisoformat(startDateTime)
-        if isinstance(startDateTime, datetime):
-            startDateTime = int(startDateTime.timestamp())
-
-        if isinstance(endDateTime, str):
-            endDateTime = datetime.fromisoformat(endDateTime)
-        if isinstance(endDateTime, datetime):
-            endDateTime = int(endDateTime.timestamp())
-
         criteria = {
             "node": pointId,
-            "start": startDateTime,
-            "end": endDateTime,
+            "start": _to_timestamp(startDateTime),
+            "end": _to_timestamp(endDateTime),
             "parameters": parameters,
         }
 
@@ -133,23 +868,7 @@ class Client:
         `endDateTime`, and with one column per parameter.
         """
 
-        search_parameters = parse_qs(urlparse(unquote_plus(selection_url)).query)
-        if not search_parameters:
-            raise ValueError("no criteria found in the url")
-
-        criteria = {
-            "node": int(search_parameters["pointId"][0]),
-            "parameter": parameters,
-        }
-
-        if "startDateTime" in search_parameters:
-            start = search_parameters["startDateTime"][0].rstrip("Z")
-            criteria["start"] = int(datetime.fromisoformat(start).timestamp())
-
-        if "endDateTime" in search_parameters:
-            end = search_parameters["endDateTime"][0].rstrip("Z")
-            criteria["end"] = int(datetime.fromisoformat(end).timestamp())
-
+        criteria = _criteria_from_url(selection_url, parameters)
         return self.get_dataframe_from_criteria(criteria)
 
     def get_dataframe_from_criteria(self, criteria: Union[str, dict]) -> pd.DataFrame:
@@ -180,132 +899,517 @@ class Client:
         data: a Pandas DataFrame of the selected data
         """
 
-        min_date = self.config.get("default", "min-start-date")
-        max_date = datetime.today().isoformat()
-        default_criteria = {
-            "node": 1,
-            "start": int(datetime.fromisoformat(min_date).timestamp()),
-            "end": int(datetime.fromisoformat(max_date).timestamp()),
+        parsed_criteria = self._parse_criteria(criteria)
+        parameters = list(parsed_criteria.get("parameter", ()))
+        criteria_list = self._split_criteria(parsed_criteria)
+        parameter_arrays = self._get_arrays_from_criteria_list(
+            criteria_list, return_exceptions=True
+        )
+        return self._build_dataframe(
+            parameters,
+            self._source_arrays(criteria_list, parameter_arrays),
+            self.dtype,
+        )
+
+    def get_table(
+        self,
+        pointId: int,
+        startDateTime: Optional[Union[str, datetime, int]] = None,
+        endDateTime: Optional[Union[str, datetime, int]] = None,
+        parameters: Iterable[str] = ("hs",),
+    ) -> pa.Table:
+        """Get a pyarrow Table of the data described by the criteria
+
+        The parameters are the same as :py:meth:`get_dataframe`. See
+        :py:meth:`get_table_from_criteria`.
+        """
+        criteria = {
+            "node": pointId,
+            "start": _to_timestamp(startDateTime),
+            "end": _to_timestamp(endDateTime),
+            "parameters": parameters,
         }
 
-        if isinstance(criteria, str):
-            parsed_criteria = json.loads(criteria)
-        else:
-            parsed_criteria = criteria
+        return self.get_table_from_criteria(criteria)
 
-        # make sure compulsory parameters are present (node, dates) and are not
-        # None.
-        parsed_criteria = {**default_criteria, **parsed_criteria}
+    def get_table_from_criteria(self, criteria: Union[str, dict]) -> pa.Table:
+        """return the pyarrow Table of the data described by the criteria
 
-        if "parameters" in parsed_criteria:
-            # let's tolerate `parameter` and `parameters`
-            parsed_criteria["parameter"] = parsed_criteria["parameters"]
+        The criteria are the same as :py:meth:`get_dataframe_from_criteria`.
+        The table has a "time" column, then a column per parameter, in the
+        dtype of the client (see :py:func:`resourcecode.dtypes.build_table`).
+        The parameters that failed are reported, as a json dictionnary, in the
+        `errors` metadata of the table.
 
-        result_array = None
-        parameters = parsed_criteria.get("parameter", ())
-        unknown_parameters = set(parameters) - self.possible_parameters
-        if unknown_parameters:
-            raise BadParameterError(
-                f"{','.join(unknown_parameters)} parameter(s) is/are unknown. "
-                "Please have to look to `resourcecode.data.get_variables()`, "
-                "to get the accepted parameters."
-            )
+        Each column is built once, and can be handed over to Parquet/Feather
+        writers or Arrow-based engines without copy. Use
+        ``table.to_pandas(split_blocks=True)`` to get a dataframe without
+        copying the float columns.
 
-        try:
-            node_id = int(parsed_criteria["node"])
-        except ValueError:  # failed to convert node to an integer
-            raise BadPointIdError(
-                "Point Id must be an integer, can not be "
-                f"{parsed_criteria['node']!r}"
-            )
-        else:
-            if node_id not in self.possible_points_id:
-                raise BadPointIdError(
-                    f"{parsed_criteria['node']} is an unknown pointId."
+        Parameters
+        ----------
+        criteria: string (json) or dict
+            a json-formatted string describing the criteria
+            or the criteria as a dictionary
+
+        Return
+        ------
+        data: a pyarrow Table of the selected data
+        """
+        parsed_criteria = self._parse_criteria(criteria)
+        parameters = list(parsed_criteria.get("parameter", ()))
+        criteria_list = self._split_criteria(parsed_criteria)
+        parameter_arrays = self._get_arrays_from_criteria_list(
+            criteria_list, return_exceptions=True
+        )
+        return self._build_table(
+            parameters,
+            self._source_arrays(criteria_list, parameter_arrays),
+            self.dtype,
+        )
+
+    def get_dataframes(
+        self,
+        pointIds: Iterable[int],
+        startDateTime: Optional[Union[str, datetime, int]] = None,
+        endDateTime: Optional[Union[str, datetime, int]] = None,
+        parameters: Iterable[str] = ("hs",),
+        concat: bool = False,
+    ) -> Tuple[Union[Dict[int, pd.DataFrame], pd.DataFrame], Dict[int, Exception]]:
+        """Get the pandas dataframes of the data of several points
+
+        All the queries (one per point and per parameter) are sent
+        concurrently, using at most `max_workers` connections. A point that
+        fails (because it is unknown, or because the database did not answer)
+        does not abort the whole extraction: it is reported in the returned
+        errors.
+
+        The queries are scheduled as batch work: when the client is shared by
+        several threads, the queries of `get_dataframe` are sent first.
+
+        Parameters
+        ----------
+
+        pointIds: list of int
+            the ids of the points to get data from
+        startDateTime: optional datetime or string (date in isoformat) or int (timestamp)
+            the start of the selection.
+            if not given, the oldest possible value will be used.
+        endDateTime: optional datetime or string (date in isoformat) or int (timestamp)
+            the end of the selelection.
+            if not given, the most recent possible value will be used.
+        parameters: list of string
+            the parameters to retrieve
+        concat: bool
+            if True, the data of all the points are concatenated in a single
+            dataframe, indexed by (pointId, datetime).
+
+        Return
+        ------
+
+        (data, errors)
+            `data` is a dictionnary whose keys are the point ids and values
+            are dataframes like the ones returned by `get_dataframe`, or a
+            single dataframe if `concat` is True. `errors` is a dictionnary
+            whose keys are the point ids that failed, and values the
+            corresponding exceptions.
+        """
+
+        parameters = list(parameters)
+        criteria = {
+            "start": _to_timestamp(startDateTime),
+            "end": _to_timestamp(endDateTime),
+            "parameters": parameters,
+        }
+
+        errors: Dict[int, Exception] = {}
+        point_criteria = {}
+        for pointId in pointIds:
+            try:
+                point_criteria[pointId] = self._split_criteria(
+                    self._parse_criteria({**criteria, "node": pointId})
                 )
+            except BadPointIdError as failure:
+                errors[pointId] = failure
 
-        # Cassandra database start indexing at 1, so decrement node
-        parsed_criteria["node"] = parsed_criteria["node"] - 1
-
-        for parameter in parsed_criteria.get("parameter", ()):
-            # we assume that multiple parameters can be given.
-            # for each parameter, we make a query and we concatenate all the
-            # responses.
-
-            # tp is not a real parameter. it is equal to 1/fp.
-            single_parameter = parameter.lower()
-            if parameter == "tp":
-                single_parameter = "fp"
-            single_parameter_criteria = {
-                **parsed_criteria,
-                "parameter": [
-                    single_parameter,
+        parameter_arrays = iter(
+            self._get_arrays_from_criteria_list(
+                [
+                    single_criteria
+                    for criteria_list in point_criteria.values()
+                    for single_criteria in criteria_list
                 ],
-            }
-            raw_data = self._get_rawdata_from_criteria(single_parameter_criteria)
-            # parameter_array is the time history of the current parameter.
-            # it's a 2D array. The first columns is the timestamp, the second
-            # one the value of this parameters at the corresponding timestamps.
-            parameter_array = np.array(raw_data["result"]["data"], dtype=float)
-            if parameter == "tp":
-                parameter_array[:, 1] = 1 / parameter_array[:, 1]
+                return_exceptions=True,
+                priority=BATCH,
+            )
+        )
 
+        dataframes = {}
+        for pointId, criteria_list in point_criteria.items():
+            arrays = [next(parameter_arrays) for _ in criteria_list]
             try:
-                # concatenate and get ride of the timestamp (already known from
-                # the previous iteration)
-                result_array = np.column_stack((result_array, parameter_array[:, 1]))  # type: ignore
-            except ValueError:
-                result_array = parameter_array
-                index_array = parameter_array[:, 0]
-                mask_index_nan = np.isnan(index_array)
-            except Exception:
-                if raw_data["query"]["dataSetSize"] == 0:
-                    print(
-                        "It appears the API failed to returned the expected values. "
-                        "You may try to recall the function in a few moment.",
-                        file=sys.stderr,
-                    )
-                    return pd.DataFrame()
-                raise
-
-            # the index may be incomplete in some cases (when the variable is
-            # NaN).
-            # let's try to have the more complete index as possible, as the
-            # index should be the same for all the variable
-
-            if mask_index_nan.any():
-                index_array[mask_index_nan] = parameter_array[mask_index_nan, 0]
-                mask_index_nan = np.isnan(index_array)
-
-        if result_array is None:
-            raise ValueError("no selection parameter found")
+                dataframes[pointId] = self._build_dataframe(
+                    parameters, self._source_arrays(criteria_list, arrays), self.dtype
+                )
+            except Exception as failure:
+                errors[pointId] = failure
+
+        for pointId in errors:
+            LOGGER.warning(
+                "failed to get the data of point %s: %s", pointId, errors[pointId]
+            )
+
+        if concat:
+            if not dataframes:
+                return pd.DataFrame(), errors
+            return pd.concat(dataframes, names=["pointId"]), errors
+        return dataframes, errors
+
+    def get_interpolated_dataframe(
+        self,
+        latitude: float,
+        longitude: float,
+        startDateTime: Optional[Union[str, datetime, int]] = None,
+        endDateTime: Optional[Union[str, datetime, int]] = None,
+        parameters: Iterable[str] = ("hs",),
+    ) -> pd.DataFrame:
+        """Get a pandas dataframe of the data interpolated at the given position
+
+        The position is located in a triangle of the mesh: the data of its three
+        corners are fetched concurrently, then linearly interpolated (see
+        :py:func:`resourcecode.data.get_interpolation_weights`). The directions
+        are interpolated as angles.
+
+        Parameters
+        ----------
+
+        latitude: float
+            the latitude in decimal degrees
+        longitude: float
+            the longitude in decimal degrees
+        startDateTime: optional datetime or string (date in isoformat) or int (timestamp)
+            the start of the selection.
+            if not given, the oldest possible value will be used.
+        endDateTime: optional datetime or string (date in isoformat) or int (timestamp)
+            the end of the selelection.
+            if not given, the most recent possible value will be used.
+        parameters: list of string
+            the parameters to retrieve
+
+        Return
+        ------
+
+        A pandas dataframe like the one returned by `get_dataframe`. Its
+        `attrs["points"]` attribute gives the ids of the interpolated points,
+        and `attrs["weights"]` their weights.
+        """
 
-        return pd.DataFrame(
-            result_array[:, 1:],
-            columns=parsed_criteria["parameter"],
-            index=pd.to_datetime(index_array.astype(np.int64), unit="ms"),
+        point_ids, weights = get_interpolation_weights(latitude, longitude)
+        if point_ids[0] < 0:
+            raise ValueError(
+                f"the position ({latitude}, {longitude}) is outside of the mesh"
+            )
+
+        parameters = list(parameters)
+        criteria_lists = [
+            self._split_criteria(
+                self._parse_criteria(
+                    {
+                        "node": int(pointId),
+                        "start": _to_timestamp(startDateTime),
+                        "end": _to_timestamp(endDateTime),
+                        "parameters": parameters,
+                    }
+                )
+            )
+            for pointId in point_ids
+        ]
+        parameter_arrays = iter(
+            self._get_arrays_from_criteria_list(
+                [
+                    criteria
+                    for criteria_list in criteria_lists
+                    for criteria in criteria_list
+                ],
+                return_exceptions=True,
+            )
         )
 
-    def _get_rawdata_from_criteria(self, single_parameter_criteria):
-        """return the json of the data described by the parameters
+        dataframes = []
+        errors: Dict[str, BaseException] = {}
+        for criteria_list in criteria_lists:
+            arrays = [next(parameter_arrays) for _ in criteria_list]
+            dataframe = self._build_dataframe(
+                parameters, self._source_arrays(criteria_list, arrays)
+            )
+            if dataframe.empty:
+                return dataframe
+            errors.update(dataframe.attrs["errors"])
+            dataframes.append(dataframe)
+
+        # a parameter is interpolated if it is known at all the corners.
+        columns = [parameter for parameter in parameters if parameter not in errors]
+        interpolated = _interpolate(
+            [dataframe[columns] for dataframe in dataframes], weights
+        )
+        dataframe = build_dataframe(
+            columns,
+            [interpolated[column].to_numpy() for column in columns],
+            interpolated.index,
+            self.dtype,
+        )
+        dataframe.attrs.update(
+            errors=errors, points=point_ids.tolist(), weights=weights.tolist()
+        )
+        return dataframe
+
+    def _get_arrays_from_criteria_list(
+        self,
+        criteria_list: List[dict],
+        return_exceptions: bool = False,
+        priority: int = INTERACTIVE,
+    ) -> list:
+        """return the time history described by each criteria of the list
+
+        Each time history is split into the time windows to fetch from the
+        database: the time ranges missing from the cache (if any), themselves
+        split into chunks of `chunk_frequency` (if set). All the windows are
+        fetched concurrently, using at most `max_workers` threads, then
+        concatenated back. The time histories are returned in the same order
+        as the criteria.
 
         Parameters
         ----------
-        parameters: dict
-            the dictionnary of parameters to give to cassandra
+        criteria_list: list of dict
+            the list of parameters dictionnaries to give to cassandra
+        return_exceptions: bool
+            if True, the exception raised by a query is returned in place of
+            its time history, instead of being raised.
+        priority: int
+            the priority of the queries, see `RequestScheduler`.
 
         Result
         ------
-        result: json
-            the json result returned by the cassandra database.
+        result: list of numpy arrays
+            the time histories. Each of them is a 2D array. The first columns
+            is the timestamp (in milliseconds), the second one the value of the
+            parameter at the corresponding timestamps. The array is empty if
+            the database returned no data.
         """
-        query_url = urljoin(self.cassandra_base_url, "api/timeseries")
+        plans = [self._plan_criteria(criteria) for criteria in criteria_list]
 
-        response = requests.get(query_url, single_parameter_criteria)
-        if response.ok:
-            return response.json()
-
-        raise ValueError(
-            "Unable to get a response from the database"
-            "(status code = {})".format(response.status_code)
+        # the same window may be requested several times (for instance, when
+        # a point is given twice to `get_dataframes`): fetch it once.
+        unique_windows = {
+            _criteria_key(window): window for _, windows in plans for window in windows
+        }
+        fetched_arrays = dict(
+            zip(
+                unique_windows,
+                self._map(
+                    partial(self._fetch_window, priority=priority),
+                    list(unique_windows.values()),
+                ),
+            )
+        )
+        # the windows successfully fetched are cached even if some others
+        # failed, so that they are not fetched again on the next call.
+        self._cache_windows(
+            list(unique_windows.values()), list(fetched_arrays.values())
         )
+
+        results: list = []
+        for cached_array, windows in plans:
+            arrays = [fetched_arrays[_criteria_key(window)] for window in windows]
+            failures = [array for array in arrays if isinstance(array, Exception)]
+            if failures and not return_exceptions:
+                raise failures[0]
+            if failures:
+                results.append(failures[0])
+            else:
+                results.append(self._assemble_windows(cached_array, arrays))
+        return results
+
+    def _map(self, function: Callable, items: list) -> list:
+        """Call the function on each item, using at most `max_workers` threads.
+
+        The exceptions raised by the function are returned in place of the
+        results.
+        """
+
+        def call(item):
+            try:
+                return function(item)
+            except Exception as error:
+                return error
+
+        max_workers = min(self.max_workers, len(items))
+        if max_workers <= 1:
+            return [call(item) for item in items]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(call, items))
+
+    def _plan_criteria(
+        self, single_parameter_criteria: dict
+    ) -> Tuple[Optional[np.ndarray], List[dict]]:
+        """Split the criteria into the time windows to fetch from the database
+
+        If the client has a cache, the part of the time history available in
+        the cache is returned, and only the time ranges missing from the cache
+        are fetched.
+
+        Result
+        ------
+        (cached_array, windows)
+            the part of the time history found in the cache (None if the
+            client has no cache), and the criteria of each time window to
+            fetch.
+        """
+        start = single_parameter_criteria["start"]
+        end = single_parameter_criteria["end"]
+
+        cached_array = None
+        missing_intervals = [(start, end)]
+        if self.cache is not None:
+            cached_array, missing_intervals = self.cache.lookup(
+                # the cache is indexed by pointId, which starts at 1.
+                single_parameter_criteria["node"] + 1,
+                single_parameter_criteria["parameter"][0],
+                start,
+                end,
+            )
+
+        windows = []
+        for missing_start, missing_end in missing_intervals:
+            for window_start, window_end in _split_time_range(
+                missing_start, missing_end, self.chunk_frequency
+            ):
+                windows.append(
+                    {
+                        **single_parameter_criteria,
+                        "start": window_start,
+                        "end": window_end,
+                    }
+                )
+        return cached_array, windows
+
+    def _cache_windows(self, windows: List[dict], arrays: list):
+        """Store the fetched time windows into the cache (if any). The windows
+        that failed are skipped."""
+        if self.cache is None:
+            return
+
+        for window, array in zip(windows, arrays):
+            if isinstance(array, Exception):
+                continue
+            self.cache.put(
+                window["node"] + 1,
+                window["parameter"][0],
+                window["start"],
+                window["end"],
+                array,
+            )
+
+    @staticmethod
+    def _assemble_windows(
+        cached_array: Optional[np.ndarray], arrays: List[np.ndarray]
+    ) -> np.ndarray:
+        """Concatenate the time history of the fetched time windows, and the
+        cached one."""
+
+        if cached_array is None:
+            if len(arrays) == 1:
+                return arrays[0]
+            # the windows are chronological and disjoint.
+            return np.concatenate([array.reshape(-1, 2) for array in arrays])
+
+        if not arrays:
+            return cached_array
+        return merge_series([cached_array, *arrays])[0]
+
+    def _fetch_window(
+        self, single_parameter_criteria: dict, priority: int = INTERACTIVE
+    ) -> np.ndarray:
+        """return the time history of the data described by the parameters,
+        fetched from the database.
+
+        If the same query is already running in another thread, its result is
+        awaited instead of sending the query again.
+        """
+        key = _criteria_key(single_parameter_criteria)
+        with self._in_flight_lock:
+            future = self._in_flight.get(key)
+            is_owner = future is None
+            if future is None:
+                future = self._in_flight[key] = Future()
+
+        if not is_owner:
+            LOGGER.debug("waiting for the running query %s", key)
+            return future.result()
+
+        try:
+            array = self._fetch_array_with_retries(single_parameter_criteria, priority)
+        except BaseException as failure:
+            future.set_exception(failure)
+            raise
+        else:
+            future.set_result(array)
+            return array
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
+
+    def _fetch_array_with_retries(
+        self, single_parameter_criteria: dict, priority: int = INTERACTIVE
+    ) -> np.ndarray:
+        """return the time history of the data described by the parameters,
+        fetched from the database.
+
+        The query is sent again, up to `retries` times, when it fails because
+        of a connection error, a server error, or when the database returns no
+        data within the hindcast period. The attempts are spaced by an
+        exponential backoff, see `_retry_delay`.
+        """
+        attempt = 0
+        while True:
+            try:
+                array = self._fetch_array(single_parameter_criteria, priority)
+                self._check_result(single_parameter_criteria, array)
+                return array
+            except (requests.RequestException, FetchError) as failure:
+                if not getattr(failure, "retryable", True) or attempt >= self.retries:
+                    raise
+                attempt += 1
+                delay = self._retry_delay(attempt)
+                LOGGER.warning(
+                    "failed to get %s at node %s (%s), retrying in %.1fs",
+                    single_parameter_criteria["parameter"][0],
+                    single_parameter_criteria["node"] + 1,
+                    failure,
+                    delay,
+                )
+                time.sleep(delay)
+
+    def _fetch_array(
+        self, single_parameter_criteria: dict, priority: int = INTERACTIVE
+    ) -> np.ndarray:
+        """return the time history of the data described by the parameters,
+        fetched from the database.
+
+        The query is sent once the scheduler allows it. The response is
+        decoded while it is downloaded, see `TimeseriesDecoder`.
+        """
+        with self.scheduler.slot(priority):
+            response = self.session.get(
+                self.timeseries_url, single_parameter_criteria, stream=True
+            )
+            try:
+                _check_status(response.ok, response.status_code)
+
+                decoder = TimeseriesDecoder()
+                for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                    decoder.feed(chunk)
+                return decoder.result()
+            finally:
+                response.close()
@@ -17,33 +17,73 @@
 # You should have received a copy of the GNU General Public License along
 # with Resourcecode. If not, see <https://www.gnu.org/licenses/>.
 
-from typing import Tuple, Any
-from functools import partial
+from typing import Callable, Optional, Sequence, Tuple, Any
+from functools import lru_cache
 from pathlib import Path
 
 import datetime
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+from pyarrow import feather
+from numpy.typing import ArrayLike
 
-from resourcecode.utils import haversine
+from resourcecode.exceptions import BadPointIdError
+from resourcecode.utils import EARTH_RADIUS_METER, haversine
 
 DATA_DIR = Path(__file__).parent
 
-get_coastline = partial(pd.read_feather, DATA_DIR / "coastline.feather")
-get_grid_field = partial(pd.read_feather, DATA_DIR / "grid_FIELD.feather")
-get_grid_spec = partial(pd.read_feather, DATA_DIR / "grid_SPEC.feather")
-get_islands = partial(pd.read_feather, DATA_DIR / "islands.feather")
-get_triangles = partial(pd.read_feather, DATA_DIR / "triangles.feather")
-get_variables = partial(pd.read_feather, DATA_DIR / "variables.feather")
+# the tolerance on the barycentric coordinates of a position lying on the edge
+# of a triangle
+_BARYCENTRIC_TOLERANCE = 1e-9
+
+
+@lru_cache(maxsize=None)
+def _read_table(filename: str, memory_map: bool = True) -> pa.Table:
+    """Read the Feather file of the data directory, once.
+
+    The record batches of the file are combined, so that the columns of the
+    table are contiguous and can be handed out to pandas without copy.
+    """
+    table = feather.read_table(DATA_DIR / filename, memory_map=memory_map)
+    return table.combine_chunks()
+
+
+def _loader(filename: str) -> Callable[..., pd.DataFrame]:
+    def load(
+        columns: Optional[Sequence[str]] = None,
+        use_threads: bool = True,
+        memory_map: bool = True,
+    ) -> pd.DataFrame:
+        table = _read_table(filename, memory_map)
+        if columns is not None:
+            table = table.select(list(columns))
+        return table.to_pandas(use_threads=use_threads, split_blocks=True)
+
+    return load
+
+
+get_coastline = _loader("coastline.feather")
+get_grid_field = _loader("grid_FIELD.feather")
+get_grid_spec = _loader("grid_SPEC.feather")
+get_islands = _loader("islands.feather")
+get_triangles = _loader("triangles.feather")
+get_variables = _loader("variables.feather")
 
 # those parameters are from the feather.read_feather function
 COMMON_PARAMETERS = """\
+The file is read once, then cached (see `clear_cache`). The numerical columns
+of the returned dataframe are read-only views of the cached data: assigning a
+new column is fine, but modifying the values in place raises an error. Use
+`.copy()` to get a modifiable dataframe.
+
 Parameters
 ----------
 columns : sequence, optional
     Only read a specific set of columns. If not provided, all columns are
     read.
 use_threads: bool, default True
-    Whether to parallelize reading using multiple threads.
+    Whether to parallelize the conversion to pandas using multiple threads.
 memory_map : boolean, default True
     Use memory mapping when opening file on disk
 
@@ -102,18 +142,76 @@ The default returned columns are: name, longname, unit
 """
 
 
-def _get_closest(
-    dataset: pd.DataFrame, latitude: float, longitude: float, returned_attribute: str
-) -> Tuple[Any, float]:
+def _to_unit_sphere(latitude, longitude) -> np.ndarray:
+    """Return the cartesian coordinates of the positions on the unit sphere"""
+    latitude, longitude = np.radians(latitude), np.radians(longitude)
+    return np.stack(
+        (
+            np.cos(latitude) * np.cos(longitude),
+            np.cos(latitude) * np.sin(longitude),
+            np.sin(latitude),
+        ),
+        axis=-1,
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_spatial_index(loader: Callable[[], pd.DataFrame]):
+    """Return a KD-tree of the positions of the dataset returned by `loader`,
+    and the dataset.
+
+    The tree is built on the cartesian coordinates of the positions on the unit
+    sphere: the closest position in the tree is the closest one on the Earth.
+    It is built on first use, then reused.
+    """
+    from scipy.spatial import cKDTree
+
+    dataset = loader()
+    tree = cKDTree(_to_unit_sphere(dataset.latitude, dataset.longitude))
+    return tree, dataset
+
+
+def _get_k_closest(
+    loader: Callable[[], pd.DataFrame],
+    latitudes: ArrayLike,
+    longitudes: ArrayLike,
+    k: int,
+    returned_attribute: str,
+) -> Tuple[np.ndarray, np.ndarray]:
+    latitudes = np.asarray(latitudes, dtype=float)
+    longitudes = np.asarray(longitudes, dtype=float)
+    if latitudes.shape != longitudes.shape:
+        raise ValueError(
+            "latitudes and longitudes must have the same shape, got "
+            f"{latitudes.shape} and {longitudes.shape}"
+        )
+
+    tree, dataset = _get_spatial_index(loader)
+    if not 1 <= k <= len(dataset):
+        raise ValueError(f"k must be between 1 and {len(dataset)}, got {k}")
+
+    _, indices = tree.query(_to_unit_sphere(latitudes, longitudes), k=k)
+    if k > 1:
+        latitudes, longitudes = latitudes[..., None], longitudes[..., None]
     distances = haversine(
-        dataset.latitude,
-        dataset.longitude,
-        latitude,
-        longitude,
+        dataset.longitude.to_numpy()[indices],
+        dataset.latitude.to_numpy()[indices],
+        longitudes,
+        latitudes,
     )
+    return dataset[returned_attribute].to_numpy()[indices], distances.round(2)
+
 
-    min_idx = distances.idxmin()
-    return dataset.loc[min_idx, returned_attribute], distances[min_idx].round(2)
+def _get_closest(
+    loader: Callable[[], pd.DataFrame],
+    latitude: float,
+    longitude: float,
+    returned_attribute: str,
+) -> Tuple[Any, float]:
+    values, distances = _get_k_closest(
+        loader, [latitude], [longitude], 1, returned_attribute
+    )
+    return values[0], distances[0]
 
 
 def get_closest_point(latitude: float, longitude: float) -> Tuple[int, float]:
@@ -134,7 +232,7 @@ def get_closest_point(latitude: float, longitude: float) -> Tuple[int, float]:
         the corresponding point id, and its distance in meters, to the requested
         coordinates
     """
-    return _get_closest(get_grid_field(), latitude, longitude, "node")
+    return _get_closest(get_grid_field, latitude, longitude, "node")
 
 
 def get_closest_station(latitude: float, longitude: float) -> Tuple[str, float]:
@@ -155,7 +253,716 @@ def get_closest_station(latitude: float, longitude: float) -> Tuple[str, float]:
         the corresponding station name, and its distance in meters, to the
         requested coordinates
     """
-    return _get_closest(get_grid_spec(), latitude, longitude, "name")
+    return _get_closest(get_grid_spec, latitude, longitude, "name")
+
+
+def get_closest_points(
+    latitudes: ArrayLike, longitudes: ArrayLike, k: int = 1
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the k closest points in the mesh, from each of the given positions
+
+    Parameters
+    ----------
+
+    latitudes
+        the latitudes in decimal degrees
+    longitudes
+        the longitudes in decimal degrees, in the same shape as `latitudes`
+    k
+        the number of points to return for each position, by increasing
+        distance
+
+    Return
+    ------
+
+    (pointIds, distances)
+        the arrays of the corresponding point ids, and of their distances in
+        meters to the requested coordinates. With k=1, they have the shape of
+        `latitudes`, otherwise they have an additional last dimension of size k.
+    """
+    return _get_k_closest(get_grid_field, latitudes, longitudes, k, "node")
+
+
+def get_closest_stations(
+    latitudes: ArrayLike, longitudes: ArrayLike, k: int = 1
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the k closest station names, from each of the given positions
+
+    Parameters
+    ----------
+
+    latitudes
+        the latitudes in decimal degrees
+    longitudes
+        the longitudes in decimal degrees, in the same shape as `latitudes`
+    k
+        the number of stations to return for each position, by increasing
+        distance
+
+    Return
+    ------
+
+    (station names, distances)
+        the arrays of the corresponding station names, and of their distances
+        in meters to the requested coordinates. With k=1, they have the shape
+        of `latitudes`, otherwise they have an additional last dimension of
+        size k.
+    """
+    return _get_k_closest(get_grid_spec, latitudes, longitudes, k, "name")
+
+
+@lru_cache(maxsize=None)
+def _get_triangle_index():
+    """Return a KD-tree of the centroids of the triangles of the mesh, with the
+    positions (longitude, latitude) of their corners and the indexes of their
+    corners in the grid field.
+
+    The triangles are located in the (longitude, latitude) plane, in which the
+    corner values are linearly interpolated. The tree is built on first use,
+    then reused.
+    """
+    from scipy.spatial import cKDTree
+
+    grid = get_grid_field(columns=["longitude", "latitude"])
+    positions = np.stack((grid.longitude, grid.latitude), axis=-1)
+    corners = get_triangles().to_numpy() - 1
+    vertices = positions[corners]
+    return cKDTree(vertices.mean(axis=1)), vertices, corners
+
+
+@lru_cache(maxsize=None)
+def _get_triangle_bins():
+    """Return a regular grid of cells covering the mesh, each cell listing the
+    triangles whose bounding box overlaps it.
+
+    The cells are about the size of the largest triangles (except the few
+    largest ones, spanning several cells). The grid is built on first use,
+    then reused.
+
+    Result
+    ------
+    (origin, cell_size, shape, offsets, triangles)
+        the position of the corner of the first cell, the size of the cells,
+        the number of cells along the longitude and the latitude, and the
+        triangles of the cell `i` (numbered along the latitude first), which
+        are `triangles[offsets[i]:offsets[i + 1]]`.
+    """
+    _, vertices, _ = _get_triangle_index()
+    lower, upper = vertices.min(axis=1), vertices.max(axis=1)
+    origin = lower.min(axis=0)
+    cell_size = np.percentile((upper - lower).max(axis=1), 99)
+    first = ((lower - origin) // cell_size).astype(int)
+    last = ((upper - origin) // cell_size).astype(int)
+    shape = last.max(axis=0) + 1
+
+    # the cells overlapped by each triangle, expanded into (cell, triangle)
+    # pairs
+    spans = last - first + 1
+    counts = spans[:, 0] * spans[:, 1]
+    triangles = np.repeat(np.arange(len(vertices)), counts)
+    ranks = np.arange(len(triangles)) - np.repeat(np.cumsum(counts) - counts, counts)
+    cells = (first[triangles, 0] + ranks // spans[triangles, 1]) * shape[1] + (
+        first[triangles, 1] + ranks % spans[triangles, 1]
+    )
+
+    order = np.argsort(cells, kind="stable")
+    offsets = np.zeros(shape.prod() + 1, dtype=int)
+    np.cumsum(np.bincount(cells, minlength=shape.prod()), out=offsets[1:])
+    return origin, cell_size, shape, offsets, triangles[order]
+
+
+def _barycentric_weights(vertices: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Return the barycentric coordinates of the points (..., 2) in the
+    triangles (..., 3, 2). They are NaN for the degenerated triangles."""
+    origin = vertices[..., 0, :]
+    u = vertices[..., 1, :] - origin
+    v = vertices[..., 2, :] - origin
+    w = points - origin
+    with np.errstate(divide="ignore", invalid="ignore"):
+        determinant = u[..., 0] * v[..., 1] - u[..., 1] * v[..., 0]
+        weight_1 = (w[..., 0] * v[..., 1] - w[..., 1] * v[..., 0]) / determinant
+        weight_2 = (u[..., 0] * w[..., 1] - u[..., 1] * w[..., 0]) / determinant
+    return np.stack((1 - weight_1 - weight_2, weight_1, weight_2), axis=-1)
+
+
+def _locate(
+    latitudes: np.ndarray, longitudes: np.ndarray, candidates: int = 8
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the index of the triangle of the mesh containing each position
+    (-1 if it is outside of the mesh), and the barycentric coordinates of the
+    position in it (NaN if it is outside of the mesh).
+
+    The triangles whose centroid is among the closest ones are tried first, all
+    the positions at once. For the positions not found in them, all the
+    triangles whose bounding box overlaps the cell of the position (see
+    `_get_triangle_bins`) are tried; the positions out of the grid of cells
+    are outside of the mesh.
+    """
+    tree, vertices, _ = _get_triangle_index()
+    points = np.stack((longitudes, latitudes), axis=-1).reshape(-1, 2)
+    triangles = np.full(len(points), -1)
+    weights = np.full((len(points), 3), np.nan)
+
+    def select(point_indexes, triangle_indexes):
+        """Keep, for each position, the first of its triangles containing it.
+        The pairs of (position, triangle) are sorted by position."""
+        tried_weights = _barycentric_weights(
+            vertices[triangle_indexes], points[point_indexes]
+        )
+        inside = (tried_weights >= -_BARYCENTRIC_TOLERANCE).all(axis=-1)
+        found, first = np.unique(point_indexes[inside], return_index=True)
+        found_weights = tried_weights[inside][first].clip(0, 1)
+        triangles[found] = triangle_indexes[inside][first]
+        weights[found] = found_weights / found_weights.sum(axis=-1, keepdims=True)
+
+    # the positions with NaN coordinates are outside of the mesh
+    finite = np.flatnonzero(np.isfinite(points).all(axis=-1))
+    k = min(candidates, len(vertices))
+    _, closest = tree.query(points[finite], k=k)
+    select(np.repeat(finite, k), closest.ravel())
+
+    origin, cell_size, shape, offsets, cell_triangles = _get_triangle_bins()
+    remaining = finite[triangles[finite] < 0]
+    cell_indexes = (points[remaining] - origin) // cell_size
+    in_grid = ((cell_indexes >= 0) & (cell_indexes < shape)).all(axis=-1)
+    remaining = remaining[in_grid]
+    cell_indexes = cell_indexes[in_grid].astype(int)
+    cells = cell_indexes[:, 0] * shape[1] + cell_indexes[:, 1]
+
+    counts = offsets[cells + 1] - offsets[cells]
+    starts = np.repeat(offsets[cells] - (np.cumsum(counts) - counts), counts)
+    select(
+        np.repeat(remaining, counts),
+        cell_triangles[starts + np.arange(counts.sum())],
+    )
+
+    shape = np.shape(latitudes)
+    return triangles.reshape(shape), weights.reshape(shape + (3,))
+
+
+def get_interpolation_weights(
+    latitudes: ArrayLike, longitudes: ArrayLike
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Get the points of the mesh, and their weights, to linearly interpolate
+    the values of the mesh at the given positions.
+
+    Each position is located in a triangle of the mesh (see `get_triangles`):
+    the values at the position are the weighted sum of the values at the three
+    corners of the triangle, the weights being the barycentric coordinates of
+    the position in the triangle.
+
+    Parameters
+    ----------
+
+    latitudes
+        the latitudes in decimal degrees
+    longitudes
+        the longitudes in decimal degrees, in the same shape as `latitudes`
+
+    Return
+    ------
+
+    (pointIds, weights)
+        the arrays of the ids of the corners of the triangles, and of their
+        weights, with an additional last dimension of size 3. The ids are -1,
+        and the weights NaN, for the positions outside of the mesh.
+    """
+    latitudes = np.asarray(latitudes, dtype=float)
+    longitudes = np.asarray(longitudes, dtype=float)
+    if latitudes.shape != longitudes.shape:
+        raise ValueError(
+            "latitudes and longitudes must have the same shape, got "
+            f"{latitudes.shape} and {longitudes.shape}"
+        )
+
+    triangles, weights = _locate(latitudes, longitudes)
+    _, _, corners = _get_triangle_index()
+    nodes = get_grid_field(columns=["node"]).node.to_numpy()
+    point_ids = np.where(triangles[..., None] >= 0, nodes[corners[triangles]], -1)
+    return point_ids, weights
+
+
+@lru_cache(maxsize=None)
+def _get_planar_index(loader: Callable[[], pd.DataFrame]):
+    """Return a KD-tree of the (longitude, latitude) positions of the dataset
+    returned by `loader`, and the dataset. It is built on first use, then
+    reused."""
+    from scipy.spatial import cKDTree
+
+    dataset = loader()
+    tree = cKDTree(np.stack((dataset.longitude, dataset.latitude), axis=-1))
+    return tree, dataset
+
+
+def _get_grid(grid: str) -> Tuple[Callable[[], pd.DataFrame], str]:
+    """Return the loader of the grid, and the attribute identifying its
+    points"""
+    grids = {"field": (get_grid_field, "node"), "spec": (get_grid_spec, "name")}
+    if grid not in grids:
+        raise ValueError(f"grid must be one of {', '.join(grids)}, got {grid!r}")
+    return grids[grid]
+
+
+def _in_bbox(
+    tree,
+    min_longitude: float,
+    min_latitude: float,
+    max_longitude: float,
+    max_latitude: float,
+) -> np.ndarray:
+    """Return the sorted indexes of the positions of the tree in the box"""
+    if min_longitude > max_longitude or min_latitude > max_latitude:
+        return np.array([], dtype=int)
+
+    center = np.array(
+        [(min_longitude + max_longitude) / 2, (min_latitude + max_latitude) / 2]
+    )
+    # the search is widened by a small margin, so that the positions on the
+    # edges are not lost to rounding errors. The bounds are then checked.
+    radius = max(max_longitude - min_longitude, max_latitude - min_latitude) / 2
+    candidates = np.array(
+        tree.query_ball_point(center, radius * (1 + 1e-9) + 1e-12, p=np.inf),
+        dtype=int,
+    )
+    candidates.sort()
+    positions = tree.data[candidates]
+    inside = (
+        (positions[:, 0] >= min_longitude)
+        & (positions[:, 0] <= max_longitude)
+        & (positions[:, 1] >= min_latitude)
+        & (positions[:, 1] <= max_latitude)
+    )
+    return candidates[inside]
+
+
+def _in_polygon(points: np.ndarray, polygon: np.ndarray) -> np.ndarray:
+    """Return whether the (longitude, latitude) points are inside the polygon,
+    with the even-odd rule"""
+    longitudes, latitudes = points[:, 0], points[:, 1]
+    inside = np.zeros(len(points), dtype=bool)
+    previous_longitude, previous_latitude = polygon[-1]
+    for longitude, latitude in polygon:
+        crosses = (latitude > latitudes) != (previous_latitude > latitudes)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossing_longitude = longitude + (previous_longitude - longitude) * (
+                latitudes - latitude
+            ) / (previous_latitude - latitude)
+        inside ^= crosses & (longitudes < crossing_longitude)
+        previous_longitude, previous_latitude = longitude, latitude
+    return inside
+
+
+def get_points_in_bbox(
+    min_latitude: float,
+    min_longitude: float,
+    max_latitude: float,
+    max_longitude: float,
+    grid: str = "field",
+) -> np.ndarray:
+    """Get the points of a grid in the given box
+
+    Parameters
+    ----------
+
+    min_latitude, min_longitude, max_latitude, max_longitude
+        the bounds of the box in decimal degrees, included
+    grid
+        "field" for the points of the mesh (see `get_grid_field`), or "spec"
+        for the stations of the spectral grid (see `get_grid_spec`)
+
+    Return
+    ------
+
+    pointIds
+        the array of the ids of the points (or the names of the stations) in
+        the box, in the order of the grid
+    """
+    loader, returned_attribute = _get_grid(grid)
+    tree, dataset = _get_planar_index(loader)
+    indexes = _in_bbox(tree, min_longitude, min_latitude, max_longitude, max_latitude)
+    return dataset[returned_attribute].to_numpy()[indexes]
+
+
+def get_points_in_polygon(
+    latitudes: ArrayLike, longitudes: ArrayLike, grid: str = "field"
+) -> np.ndarray:
+    """Get the points of a grid in the given polygon
+
+    Parameters
+    ----------
+
+    latitudes
+        the latitudes of the vertices of the polygon, in decimal degrees
+    longitudes
+        the longitudes of the vertices of the polygon, in decimal degrees
+    grid
+        "field" for the points of the mesh (see `get_grid_field`), or "spec"
+        for the stations of the spectral grid (see `get_grid_spec`)
+
+    Return
+    ------
+
+    pointIds
+        the array of the ids of the points (or the names of the stations) in
+        the polygon, in the order of the grid
+    """
+    polygon = np.stack(
+        (np.asarray(longitudes, dtype=float), np.asarray(latitudes, dtype=float)),
+        axis=-1,
+    )
+    if polygon.ndim != 2 or len(polygon) < 3:
+        raise ValueError("a polygon needs at least 3 vertices")
+
+    loader, returned_attribute = _get_grid(grid)
+    tree, dataset = _get_planar_index(loader)
+    min_longitude, min_latitude = polygon.min(axis=0)
+    max_longitude, max_latitude = polygon.max(axis=0)
+    indexes = _in_bbox(tree, min_longitude, min_latitude, max_longitude, max_latitude)
+    indexes = indexes[_in_polygon(tree.data[indexes], polygon)]
+    return dataset[returned_attribute].to_numpy()[indexes]
+
+
+def get_points_in_radius(
+    latitude: float, longitude: float, radius: float, grid: str = "field"
+) -> np.ndarray:
+    """Get the points of a grid within a distance of the given position
+
+    Parameters
+    ----------
+
+    latitude
+        the latitude in decimal degrees
+    longitude
+        the longitude in decimal degrees
+    radius
+        the distance in meters
+    grid
+        "field" for the points of the mesh (see `get_grid_field`), or "spec"
+        for the stations of the spectral grid (see `get_grid_spec`)
+
+    Return
+    ------
+
+    pointIds
+        the array of the ids of the points (or the names of the stations)
+        within the distance, in the order of the grid
+    """
+    loader, returned_attribute = _get_grid(grid)
+    tree, dataset = _get_spatial_index(loader)
+
+    # the distance on the unit sphere between the positions of the tree
+    chord = 2 * np.sin(min(max(radius, 0) / EARTH_RADIUS_METER, np.pi) / 2)
+    candidates = np.array(
+        tree.query_ball_point(_to_unit_sphere(latitude, longitude), chord), dtype=int
+    )
+    candidates.sort()
+    distances = haversine(
+        dataset.longitude.to_numpy()[candidates],
+        dataset.latitude.to_numpy()[candidates],
+        longitude,
+        latitude,
+    )
+    return dataset[returned_attribute].to_numpy()[candidates[distances <= radius]]
+
+
+@lru_cache(maxsize=None)
+def _get_mesh_graph():
+    """Return the adjacency matrix of the points of the mesh, built once from
+    the triangles (see `get_mesh_adjacency`)."""
+    from scipy.sparse import coo_matrix
+
+    grid = get_grid_field(columns=["longitude", "latitude"])
+    corners = get_triangles().to_numpy() - 1
+
+    # the edges of the triangles, in both directions. An edge shared by two
+    # triangles is merged by the conversion to CSR.
+    starts = corners.ravel()
+    ends = np.roll(corners, -1, axis=1).ravel()
+    size = len(grid)
+    graph = coo_matrix(
+        (
+            np.ones(2 * len(starts)),
+            (np.concatenate([starts, ends]), np.concatenate([ends, starts])),
+        ),
+        shape=(size, size),
+    ).tocsr()
+
+    rows = np.repeat(np.arange(size), np.diff(graph.indptr))
+    longitudes, latitudes = grid.longitude.to_numpy(), grid.latitude.to_numpy()
+    graph.data = haversine(
+        longitudes[rows],
+        latitudes[rows],
+        longitudes[graph.indices],
+        latitudes[graph.indices],
+    )
+    return graph
+
+
+def _to_indexes(pointIds: ArrayLike, size: int) -> np.ndarray:
+    """Return the indexes in the grid field of the point ids"""
+    indexes = np.asarray(pointIds, dtype=int) - 1
+    if ((indexes < 0) | (indexes >= size)).any():
+        raise BadPointIdError(f"the point ids must be between 1 and {size}")
+    return indexes
+
+
+def get_mesh_adjacency():
+    """Get the adjacency matrix of the points of the mesh
+
+    Two points are adjacent if they are the corners of the same edge of a
+    triangle (see `get_triangles`). The matrix is built once, then cached.
+
+    Return
+    ------
+
+    adjacency: scipy.sparse.csr_matrix
+        a symmetric matrix of the shape (number of points, number of points).
+        The element (i, j) is the distance in meters between the points i + 1
+        and j + 1 if they are adjacent (the rows and the columns are in the
+        order of `get_grid_field`, whose point ids start at 1). It can be
+        given to the functions of `scipy.sparse.csgraph`.
+    """
+    return _get_mesh_graph().copy()
+
+
+def get_neighbours(pointIds: ArrayLike, rings: int = 1) -> np.ndarray:
+    """Get the points of the mesh around the given points
+
+    Parameters
+    ----------
+
+    pointIds
+        the ids of the points
+    rings
+        the number of edges between the given points and the returned ones
+
+    Return
+    ------
+
+    pointIds
+        the sorted array of the ids of the points at most `rings` edges away
+        from the given points, not including them. It can be given to
+        :py:meth:`resourcecode.Client.get_dataframes`.
+    """
+    graph = _get_mesh_graph()
+    sources = np.unique(_to_indexes(np.atleast_1d(pointIds), graph.shape[0]))
+    reached = np.zeros(graph.shape[0], dtype=bool)
+    reached[sources] = True
+    frontier = sources
+    for _ in range(rings):
+        frontier = np.unique(graph[frontier].indices)
+        frontier = frontier[~reached[frontier]]
+        if not frontier.size:
+            break
+        reached[frontier] = True
+    reached[sources] = False
+    return np.flatnonzero(reached) + 1
+
+
+def get_mesh_components() -> np.ndarray:
+    """Get the connected parts of the mesh
+
+    Return
+    ------
+
+    labels
+        the array of the label of the part of each point of the mesh, in the
+        order of `get_grid_field`. Two points have the same label if they are
+        connected by edges of the triangles.
+    """
+    from scipy.sparse.csgraph import connected_components
+
+    _, labels = connected_components(_get_mesh_graph(), directed=False)
+    return labels
+
+
+def get_shortest_path(
+    source_pointId: int, target_pointId: int
+) -> Tuple[np.ndarray, float]:
+    """Get the shortest path between two points, along the edges of the mesh
+
+    Parameters
+    ----------
+
+    source_pointId
+        the id of the first point of the path
+    target_pointId
+        the id of the last point of the path
+
+    Return
+    ------
+
+    (pointIds, length)
+        the array of the ids of the points of the path, from the source to the
+        target, and its length in meters
+    """
+    from scipy.sparse.csgraph import dijkstra
+
+    graph = _get_mesh_graph()
+    source, target = _to_indexes([source_pointId, target_pointId], graph.shape[0])
+    distances, predecessors = dijkstra(
+        graph, indices=source, return_predecessors=True, limit=np.inf
+    )
+    if np.isinf(distances[target]):
+        raise ValueError(
+            f"the points {source_pointId} and {target_pointId} are not connected"
+        )
+
+    path = [target]
+    while path[-1] != source:
+        path.append(predecessors[path[-1]])
+    return np.array(path[::-1]) + 1, distances[target]
+
+
+@lru_cache(maxsize=None)
+def _get_coast_index():
+    """Return KD-trees of the vertices of the coastline and the islands, and
+    of the middles of their segments, with the ends of the segments. All the
+    positions are on the unit sphere. The trees are built on first use, then
+    reused."""
+    from scipy.spatial import cKDTree
+
+    coastline = get_coastline(columns=["longitude", "latitude"])
+    islands = get_islands(columns=["longitude", "latitude", "ID"])
+    coastline_vertices = _to_unit_sphere(coastline.latitude, coastline.longitude)
+    island_vertices = _to_unit_sphere(islands.latitude, islands.longitude)
+    same_island = islands.ID.to_numpy()[1:] == islands.ID.to_numpy()[:-1]
+
+    vertices = np.concatenate([coastline_vertices, island_vertices])
+    starts = np.concatenate(
+        [coastline_vertices[:-1], island_vertices[:-1][same_island]]
+    )
+    ends = np.concatenate([coastline_vertices[1:], island_vertices[1:][same_island]])
+
+    # the positions are along lines: the trees split their cells at the
+    # middle of the positions (sliding midpoint) rather than at their median,
+    # which is faster to query for the positions away from the coast.
+    tree_options = {"balanced_tree": False, "compact_nodes": False}
+    vertex_tree = cKDTree(vertices, **tree_options)
+    segment_tree = cKDTree((starts + ends) / 2, **tree_options)
+    return vertex_tree, segment_tree, starts, ends
+
+
+def _angle(u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """Return the angle between the unit vectors"""
+    return 2 * np.arcsin(np.minimum(np.linalg.norm(u - v, axis=-1) / 2, 1))
+
+
+def _distance_to_segments(
+    points: np.ndarray, starts: np.ndarray, ends: np.ndarray
+) -> np.ndarray:
+    """Return the distance in meters of the points (n, 3) to the closest of
+    their segments (n, k, 3), all on the unit sphere.
+
+    The segments are arcs of great circles: the distance is the one to the
+    great circle if the closest position on it is within the segment,
+    otherwise the distance to the closest end.
+    """
+    points = points[:, None]
+    normals = np.cross(starts, ends)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        normals /= np.linalg.norm(normals, axis=-1, keepdims=True)
+    offsets = (points * normals).sum(axis=-1)
+    projections = points - offsets[..., None] * normals
+    within = ((np.cross(starts, projections) * normals).sum(axis=-1) >= 0) & (
+        (np.cross(projections, ends) * normals).sum(axis=-1) >= 0
+    )
+    angles = np.minimum(_angle(points, starts), _angle(points, ends))
+    angles = np.where(within, np.arcsin(np.minimum(np.abs(offsets), 1)), angles)
+    return EARTH_RADIUS_METER * angles.min(axis=-1)
+
+
+def get_distance_to_coast(
+    latitudes: ArrayLike, longitudes: ArrayLike, candidates: int = 16
+) -> np.ndarray:
+    """Get the distance of the given positions to the closest coast
+
+    The coasts are the segments of the coastline and of the islands (see
+    `get_coastline` and `get_islands`). They are indexed once: for each
+    position, only the closest vertex and the closest segments are considered.
+
+    Parameters
+    ----------
+
+    latitudes
+        the latitudes in decimal degrees
+    longitudes
+        the longitudes in decimal degrees, in the same shape as `latitudes`
+    candidates
+        the number of segments considered for each position, the closest to
+        the position first
+
+    Return
+    ------
+
+    distances
+        the array of the distances in meters, in the shape of `latitudes`.
+        The distances are not signed: they are the same on land and at sea.
+    """
+    latitudes = np.asarray(latitudes, dtype=float)
+    longitudes = np.asarray(longitudes, dtype=float)
+    if latitudes.shape != longitudes.shape:
+        raise ValueError(
+            "latitudes and longitudes must have the same shape, got "
+            f"{latitudes.shape} and {longitudes.shape}"
+        )
+
+    vertex_tree, segment_tree, starts, ends = _get_coast_index()
+    points = _to_unit_sphere(latitudes.ravel(), longitudes.ravel())
+
+    chords, _ = vertex_tree.query(points, workers=-1)
+    distances = 2 * EARTH_RADIUS_METER * np.arcsin(np.minimum(chords / 2, 1))
+
+    # the positions are processed by blocks, to bound the memory used
+    k = min(candidates, segment_tree.n)
+    block_size = 2**16
+    for block in range(0, len(points), block_size):
+        block_slice = slice(block, block + block_size)
+        _, segments = segment_tree.query(points[block_slice], k=k, workers=-1)
+        segments = segments.reshape(len(segments), -1)
+        distances[block_slice] = np.minimum(
+            distances[block_slice],
+            _distance_to_segments(
+                points[block_slice], starts[segments], ends[segments]
+            ),
+        )
+    return distances.reshape(latitudes.shape)
+
+
+@lru_cache(maxsize=None)
+def _get_grid_distance_to_coast() -> np.ndarray:
+    grid = get_grid_field(columns=["longitude", "latitude"])
+    distances = get_distance_to_coast(grid.latitude, grid.longitude)
+    distances.flags.writeable = False
+    return distances
+
+
+def get_grid_distance_to_coast() -> np.ndarray:
+    """Get the distance of the points of the mesh to the closest coast
+
+    The distances are computed once with `get_distance_to_coast`, then cached.
+
+    Return
+    ------
+
+    distances
+        the read-only array of the distances in meters, in the order of
+        `get_grid_field`
+    """
+    return _get_grid_distance_to_coast()
+
+
+def clear_cache():
+    """Clear the cached datasets of the data directory, and the spatial
+    indexes built from them. They are read again on next use."""
+    _read_table.cache_clear()
+    _get_spatial_index.cache_clear()
+    _get_triangle_index.cache_clear()
+    _get_triangle_bins.cache_clear()
+    _get_planar_index.cache_clear()
+    _get_mesh_graph.cache_clear()
+    _get_coast_index.cache_clear()
+    _get_grid_distance_to_coast.cache_clear()
 
 
 def get_covered_period() -> dict:
@@ -183,5 +990,18 @@ __all__ = [
     "get_variables",
     "get_closest_point",
     "get_closest_station",
+    "get_closest_points",
+    "get_closest_stations",
+    "get_interpolation_weights",
+    "get_points_in_bbox",
+    "get_points_in_polygon",
+    "get_points_in_radius",
+    "get_mesh_adjacency",
+    "get_neighbours",
+    "get_mesh_components",
+    "get_shortest_path",
+    "get_distance_to_coast",
+    "get_grid_distance_to_coast",
     "get_covered_period",
+    "clear_cache",
 ]
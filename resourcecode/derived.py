@@ -0,0 +1,113 @@
+# coding: utf-8
+
+# Copyright 2020-2022 IFREMER (Brest, FRANCE), all rights reserved.
+# contact -- mailto:nicolas.raillard@ifremer.fr
+#
+# This file is part of Resourcecode.
+#
+# Resourcecode is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3.0 of the License, or any later version.
+#
+# Resourcecode is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along
+# with Resourcecode. If not, see <https://www.gnu.org/licenses/>.
+
+"""Parameters computed by the client from the ones stored in the database"""
+
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Tuple
+
+from resourcecode.utils import zmcomp2metconv
+
+
+class DerivedParameter(NamedTuple):
+    """A parameter computed from other parameters of the database
+
+    Attributes
+    ----------
+    name: str
+        the name of the parameter
+    sources: tuple of str
+        the parameters of the database it is computed from
+    function: callable
+        the function computing the values of the parameter, from the values of
+        its sources (given as numpy arrays, in the same order as `sources`)
+    """
+
+    name: str
+    sources: Tuple[str, ...]
+    function: Callable[..., Any]
+
+
+DERIVED_PARAMETERS: Dict[str, DerivedParameter] = {}
+
+
+def register_derived_parameter(
+    name: str, sources: Iterable[str], function: Callable[..., Any]
+):
+    """Register a parameter computed from other parameters of the database.
+
+    Once registered, the parameter can be requested from the clients like any
+    other parameter: its sources are fetched (once, even if they are shared
+    with other requested parameters), then its values are computed.
+
+    Example
+    -------
+
+    .. code-block:: python
+
+        from resourcecode.derived import register_derived_parameter
+
+        register_derived_parameter("hs2", ["hs"], lambda hs: hs**2)
+
+    Parameters
+    ----------
+    name: str
+        the name of the parameter
+    sources: list of str
+        the parameters of the database it is computed from. They can not be
+        derived parameters themselves.
+    function: callable
+        the vectorized function computing the values of the parameter. It is
+        called with the values of the sources (as numpy arrays, in the same
+        order as `sources`), and must return a numpy array of the same length.
+    """
+    sources = tuple(sources)
+    derived_sources = [source for source in sources if source in DERIVED_PARAMETERS]
+    if derived_sources:
+        raise ValueError(
+            f"the sources of {name} can not be derived parameters: "
+            f"{', '.join(derived_sources)}"
+        )
+    DERIVED_PARAMETERS[name] = DerivedParameter(name, sources, function)
+
+
+def get_sources(parameters: Iterable[str]) -> List[str]:
+    """Return the parameters of the database to fetch to get `parameters`,
+    each of them once, in the order they are needed."""
+    sources: Dict[str, None] = {}
+    for parameter in parameters:
+        if parameter in DERIVED_PARAMETERS:
+            sources.update(dict.fromkeys(DERIVED_PARAMETERS[parameter].sources))
+        else:
+            sources[parameter] = None
+    return list(sources)
+
+
+register_derived_parameter("tp", ["fp"], lambda fp: 1 / fp)
+register_derived_parameter(
+    "wspd", ["uwnd", "vwnd"], lambda u, v: zmcomp2metconv(u, v)[0]
+)
+register_derived_parameter(
+    "wdir", ["uwnd", "vwnd"], lambda u, v: zmcomp2metconv(u, v)[1]
+)
+register_derived_parameter(
+    "cspd", ["ucur", "vcur"], lambda u, v: zmcomp2metconv(u, v)[0]
+)
+register_derived_parameter(
+    "cdir", ["ucur", "vcur"], lambda u, v: zmcomp2metconv(u, v)[1]
+)
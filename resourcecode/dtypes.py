@@ -0,0 +1,182 @@
+# coding: utf-8
+
+# Copyright 2020-2022 IFREMER (Brest, FRANCE), all rights reserved.
+# contact -- mailto:nicolas.raillard@ifremer.fr
+#
+# This file is part of Resourcecode.
+#
+# Resourcecode is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3.0 of the License, or any later version.
+#
+# Resourcecode is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along
+# with Resourcecode. If not, see <https://www.gnu.org/licenses/>.
+
+"""Compact representations of the dataframes returned by the clients"""
+
+import json
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from resourcecode.data import DATA_DIR
+
+# the dtypes the clients can return the parameters in
+DTYPES = ("float64", "float32", "int16")
+
+# the value of the missing records in the int16 packed variables of the
+# hindcast
+INT16_FILL_VALUE = -32767
+
+with open(DATA_DIR / "netcdf_description.json") as fobj:
+    _NETCDF_DESCRIPTION = json.load(fobj)
+
+
+def get_int16_packing(parameter: str) -> Optional[Tuple[float, float]]:
+    """Return the (scale_factor, add_offset) used to store the parameter as
+    int16 in the hindcast, or None if it is not stored as int16."""
+    attrs = _NETCDF_DESCRIPTION.get(parameter, {})
+    if attrs.get("_FillValue") != INT16_FILL_VALUE or "scale_factor" not in attrs:
+        return None
+    return attrs["scale_factor"], attrs.get("add_offset", 0.0)
+
+
+def pack_int16(
+    values: np.ndarray, scale_factor: float, add_offset: float
+) -> pd.arrays.IntegerArray:
+    """Pack the values into a nullable int16 array, the way the hindcast stores
+    them: `values = packed * scale_factor + add_offset`. The NaN values are
+    masked, and the values out of the int16 range are clipped."""
+    mask = np.isnan(values)
+    packed = np.round((values - add_offset) / scale_factor)
+    np.clip(packed, INT16_FILL_VALUE + 1, np.iinfo(np.int16).max, out=packed)
+    packed[mask] = INT16_FILL_VALUE
+    return pd.arrays.IntegerArray(packed.astype(np.int16), mask)
+
+
+def build_dataframe(
+    columns: List[str],
+    values: List[np.ndarray],
+    index: pd.Index,
+    dtype: str = "float64",
+) -> pd.DataFrame:
+    """Build the dataframe of the columns values, in the given dtype.
+
+    With the float dtypes, the values are written into a single array of that
+    dtype, which backs the dataframe. With "int16", the parameters stored as
+    int16 in the hindcast are packed the same way into nullable Int16 columns
+    (the others are stored as float32), and their `scale_factor` and
+    `add_offset` are recorded in the `packing` attribute of the dataframe (see
+    `unpack`).
+    """
+    if dtype not in DTYPES:
+        raise ValueError(f"dtype must be one of {', '.join(DTYPES)}, got {dtype!r}")
+
+    if dtype != "int16":
+        array = np.empty((len(index), len(values)), dtype=dtype)
+        for i, value in enumerate(values):
+            array[:, i] = value
+        return pd.DataFrame(array, columns=columns, index=index, copy=False)
+
+    packed_columns = {}
+    packing = {}
+    for column, value in zip(columns, values):
+        column_packing = get_int16_packing(column)
+        if column_packing is None:
+            packed_columns[column] = value.astype(np.float32)
+            continue
+        scale_factor, add_offset = column_packing
+        packed_columns[column] = pack_int16(value, scale_factor, add_offset)
+        packing[column] = {"scale_factor": scale_factor, "add_offset": add_offset}
+
+    dataframe = pd.DataFrame(packed_columns, index=index)
+    dataframe.attrs["packing"] = packing
+    return dataframe
+
+
+def build_table(
+    columns: List[str],
+    values: List[np.ndarray],
+    time: np.ndarray,
+    dtype: str = "float64",
+) -> pa.Table:
+    """Build the Arrow table of the columns values, in the given dtype.
+
+    The first column of the table, "time", holds the `time` timestamps (in
+    milliseconds), the missing ones (NaN) being nulls. Each column is
+    converted once. As in the dataframes, the missing values of the float
+    columns are NaN, so that the table can be converted back to pandas
+    without copy. With "int16", the parameters are packed as in
+    `build_dataframe` (the missing values are nulls), and their `scale_factor`
+    and `add_offset` are recorded in the metadata of their field.
+    """
+    if dtype not in DTYPES:
+        raise ValueError(f"dtype must be one of {', '.join(DTYPES)}, got {dtype!r}")
+
+    missing = np.isnan(time)
+    fields = [pa.field("time", pa.timestamp("ms"))]
+    arrays = [
+        pa.array(
+            np.where(missing, 0, time).astype(np.int64),
+            type=pa.timestamp("ms"),
+            mask=missing,
+        )
+    ]
+    for column, value in zip(columns, values):
+        column_packing = get_int16_packing(column) if dtype == "int16" else None
+        if column_packing is None:
+            value_dtype = "float32" if dtype == "int16" else dtype
+            arrays.append(pa.array(value.astype(value_dtype, copy=False)))
+            fields.append(pa.field(column, arrays[-1].type))
+            continue
+
+        scale_factor, add_offset = column_packing
+        arrays.append(pa.array(pack_int16(value, scale_factor, add_offset)))
+        fields.append(
+            pa.field(
+                column,
+                pa.int16(),
+                metadata={
+                    "scale_factor": str(scale_factor),
+                    "add_offset": str(add_offset),
+                },
+            )
+        )
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields))
+
+
+def unpack(dataframe: pd.DataFrame, dtype: str = "float32") -> pd.DataFrame:
+    """Convert the int16 packed columns of a dataframe (as returned by the
+    clients with `dtype="int16"`) back to their physical values.
+
+    Parameters
+    ----------
+    dataframe: pd.DataFrame
+        the dataframe to unpack
+    dtype: str
+        the float dtype of the unpacked columns
+
+    Return
+    ------
+    dataframe: pd.DataFrame
+        a dataframe whose packed columns are replaced by their values. The
+        missing values are NaN.
+    """
+    packing = dataframe.attrs.get("packing", {})
+    unpacked = dataframe.copy(deep=False)
+    for column, column_packing in packing.items():
+        values = dataframe[column].to_numpy(dtype=dtype, na_value=np.nan)
+        unpacked[column] = values * np.array(
+            column_packing["scale_factor"], dtype=dtype
+        ) + np.array(column_packing["add_offset"], dtype=dtype)
+    unpacked.attrs = {
+        key: value for key, value in dataframe.attrs.items() if key != "packing"
+    }
+    return unpacked
@@ -28,3 +28,15 @@ class BadPointIdError(ValueError):
     """Exception raised when user queried an unknown pointId"""
 
     pass
+
+
+class FetchError(ValueError):
+    """Exception raised when the database failed to return the queried data
+
+    `retryable` tells whether the failure may be transient (server error, rate
+    limiting, empty response), so that the query may succeed if sent again.
+    """
+
+    def __init__(self, message: str, retryable: bool = False):
+        super().__init__(message)
+        self.retryable = retryable
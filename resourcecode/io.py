@@ -19,14 +19,16 @@
 # with Resourcecode. If not, see <https://www.gnu.org/licenses/>.
 
 import json
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Dict, Optional, Union
 from pathlib import Path
 
 import xarray
+import numpy as np
 import pandas as pd
 import scipy
 
 from resourcecode.data import DATA_DIR
+from resourcecode.dtypes import INT16_FILL_VALUE, get_int16_packing, unpack
 
 if TYPE_CHECKING:
     try:
@@ -37,12 +39,40 @@ if TYPE_CHECKING:
 with open(DATA_DIR / "netcdf_description.json") as fobj:
     NETCFD_DESCRIPTION = json.load(fobj)
 
+# the attributes of the hindcast variables describing their packing
+PACKING_ATTRIBUTES = ("scale_factor", "add_offset", "_FillValue")
+
+# the compression options of the netCDF4 variables written by `to_netcdf`
+COMPRESSION_PRESETS: Dict[Optional[str], dict] = {
+    None: {},
+    "fast": {"zlib": True, "complevel": 1, "shuffle": True},
+    "default": {"zlib": True, "complevel": 4, "shuffle": True},
+    "max": {"zlib": True, "complevel": 9, "shuffle": True},
+}
+
+# the maximum number of records of the chunks of the compressed variables (a
+# year of hourly records)
+CHUNK_SIZE = 24 * 366
+
 
 def to_netcdf(
-    dataframe: pd.DataFrame, path: Union[str, Path, None] = None
+    dataframe: pd.DataFrame,
+    path: Union[str, Path, None] = None,
+    compression: Optional[str] = "default",
+    pack: bool = True,
+    engine: Optional[str] = None,
 ) -> Union[bytes, "Delayed", None]:
     """Write dataframe contents to a netCFD file.
 
+    The variables are described with the attributes of the hindcast files. The
+    ones stored as int16 in the hindcast are packed the same way (with their
+    `scale_factor`, `add_offset` and `_FillValue`), the values out of the
+    int16 range being clipped.
+
+    The int16 packed columns of the dataframes returned by the clients with
+    `dtype="int16"` (see :py:func:`resourcecode.dtypes.unpack`) are written
+    from their physical values.
+
     Parameters
     ----------
     path: str, Path or file-like, optional
@@ -50,21 +80,64 @@ def to_netcdf(
         by the scipy engine. If no path is provided, this function returns the
         resulting netCDF file as bytes; in this case, we need to use scipy,
         which does not support netCDF version 4 (the default format becomes
-        NETCDF3_64BIT).
-
+        NETCDF3_64BIT), nor compression.
+    compression: str, optional
+        the compression of the variables: one of the `COMPRESSION_PRESETS`
+        ("fast", "default" or "max", from the fastest to the smallest file),
+        or None to write them uncompressed. The compressed variables are
+        chunked along their last dimension (the time). The compression only
+        applies to the files written with the netCDF4 engine, that is to
+        str or Path paths, or when `engine` is "netcdf4".
+    pack: bool
+        if False, the variables are written as floats, without packing.
+    engine: str, optional
+        the xarray engine used to write the file, chosen by xarray if None.
     """
-    xr = dataframe.to_xarray()
-    for variable in xr:
-        variable_attrs = NETCFD_DESCRIPTION.get(variable, {})
-        if not variable_attrs:
-            continue
+    if compression not in COMPRESSION_PRESETS:
+        raise ValueError(
+            f"compression must be one of {', '.join(map(str, COMPRESSION_PRESETS))}, "
+            f"got {compression!r}"
+        )
+
+    if engine is None:
+        compressed = isinstance(path, (str, Path))
+    else:
+        compressed = engine == "netcdf4"
 
-        scale_factor = variable_attrs.get("scale_factor", 1)
-        add_offset = variable_attrs.get("add_offset", 0)
+    if dataframe.attrs.get("packing"):
+        dataframe = unpack(dataframe, dtype="float64")
+
+    xr = dataframe.to_xarray()
+    encoding = {}
+    for variable in xr.data_vars:
+        variable_encoding = {}
+        shape = xr[variable].shape
+        if compressed and compression is not None and xr[variable].size:
+            variable_encoding.update(COMPRESSION_PRESETS[compression])
+            variable_encoding["chunksizes"] = (1,) * (len(shape) - 1) + (
+                min(shape[-1], CHUNK_SIZE),
+            )
+
+        variable_attrs = dict(NETCFD_DESCRIPTION.get(variable, {}))
+        packing = get_int16_packing(variable) if pack else None
+        for key in PACKING_ATTRIBUTES:
+            variable_attrs.pop(key, None)
+        if packing is not None:
+            scale_factor, add_offset = packing
+            xr[variable] = xr[variable].clip(
+                add_offset + scale_factor * (INT16_FILL_VALUE + 1),
+                add_offset + scale_factor * np.iinfo(np.int16).max,
+            )
+            variable_encoding.update(
+                dtype="int16",
+                scale_factor=scale_factor,
+                add_offset=add_offset,
+                _FillValue=INT16_FILL_VALUE,
+            )
 
-        xr[variable] = (xr[variable] - add_offset) / scale_factor
         xr[variable].attrs.update(variable_attrs)
-    return xr.to_netcdf(path)
+        encoding[variable] = variable_encoding
+    return xr.to_netcdf(path, encoding=encoding, engine=engine)
 
 
 def to_mat(
@@ -38,3 +38,5 @@ pio.templates["resourcecode"] = go.layout.Template(
         )
     ]
 )
+
+pio.templates.default = "plotly+resourcecode"
@@ -36,15 +36,13 @@ Created on Wed Dec  2 14:14:48 2020
 
 @author: david.darbinyan
 """
+
 from pathlib import Path
 from typing import Tuple
 
 import datetime as dt
 import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-
 
 pd.options.plotting.backend = "plotly"
 
@@ -153,6 +151,12 @@ def display_univar_monstats(df: pd.DataFrame, varnm: str):
     None
     """
 
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    # load the resourcecode plotly theme
+    import resourcecode.plotly_theme  # noqa
+
     exceedance, dtm, dty = univar_monstats(df, varnm)
     # Compute the percentile of rows inside each group (pct == percentage).
     exceedance.plot.line(x=varnm, y="Exceedance", color="month", line_group="month")
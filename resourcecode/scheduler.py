@@ -0,0 +1,136 @@
+# coding: utf-8
+
+# Copyright 2020-2022 IFREMER (Brest, FRANCE), all rights reserved.
+# contact -- mailto:nicolas.raillard@ifremer.fr
+#
+# This file is part of Resourcecode.
+#
+# Resourcecode is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3.0 of the License, or any later version.
+#
+# Resourcecode is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along
+# with Resourcecode. If not, see <https://www.gnu.org/licenses/>.
+
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+# the priorities of the queries: the lowest is served first.
+INTERACTIVE = 0
+BATCH = 1
+
+
+class RequestScheduler:
+    """Throttle the queries sent to the database, shared by all the threads of
+    a client.
+
+    The number of queries sent per second is limited by a token bucket: the
+    bucket holds up to one second of queries, and is refilled at `rate` tokens
+    per second. The number of queries running at the same time is limited to
+    `max_connections`.
+
+    The queries waiting for their turn are served by priority, then in the
+    order they arrived: an interactive query does not wait behind the queued
+    queries of a batch extraction.
+
+    Parameters
+    ----------
+    rate: optional float
+        the maximum number of queries sent per second. If None or 0, the
+        queries are not rate limited.
+    max_connections: optional int
+        the maximum number of queries running at the same time. If None, it
+        is not limited.
+    """
+
+    def __init__(
+        self, rate: Optional[float] = None, max_connections: Optional[int] = None
+    ):
+        if rate is not None and rate < 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        if max_connections is not None and max_connections < 1:
+            raise ValueError(
+                f"max_connections must be at least 1, got {max_connections}"
+            )
+
+        self.rate = rate or None
+        self.max_connections = max_connections
+        self.capacity = max(1.0, self.rate or 0.0)
+
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._running = 0
+        self._waiting: List[Tuple[int, int]] = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.rate is not None:
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._last_refill) * self.rate
+            )
+        self._last_refill = now
+
+    def _try_acquire(self, entry: Tuple[int, int]) -> Optional[float]:
+        """Take a token and a connection if `entry` is the next query to be
+        served. Return None on success, otherwise the time to wait before
+        trying again (0 to wait for a notification)."""
+
+        if self._waiting[0] != entry or (
+            self.max_connections is not None and self._running >= self.max_connections
+        ):
+            return 0
+
+        self._refill()
+        if self.rate is not None and self._tokens < 1:
+            return (1 - self._tokens) / self.rate
+
+        if self.rate is not None:
+            self._tokens -= 1
+        self._running += 1
+        heapq.heappop(self._waiting)
+        return None
+
+    def acquire(self, priority: int = INTERACTIVE):
+        """Wait until a query of the given priority can be sent"""
+        with self._condition:
+            entry = (priority, next(self._counter))
+            heapq.heappush(self._waiting, entry)
+            try:
+                while True:
+                    delay = self._try_acquire(entry)
+                    if delay is None:
+                        break
+                    self._condition.wait(delay or None)
+            except BaseException:
+                self._waiting.remove(entry)
+                heapq.heapify(self._waiting)
+                raise
+            finally:
+                # the next query in line may be able to go too.
+                self._condition.notify_all()
+
+    def release(self):
+        """Mark a query as finished"""
+        with self._condition:
+            self._running -= 1
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self, priority: int = INTERACTIVE) -> Iterator[None]:
+        """Context manager running a query once it is allowed to be sent"""
+        self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
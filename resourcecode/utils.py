@@ -22,6 +22,7 @@ import os
 import sys
 import configparser
 import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import Union, Tuple
 
@@ -35,30 +36,58 @@ CONFIG_FILEPATHS = [
     f"{sys.prefix}/etc/resourcecode/config.ini",
 ]
 
+# the radius of the Earth used to compute the distances, in meters
+EARTH_RADIUS_METER = 6367e3
+
 LOGGER = logging.getLogger("resourcecode.default")
 LOGGER.addHandler(logging.StreamHandler())
 LOGGER.setLevel(os.environ.get("RESOURCECODE_LOG_THRESHOLD", "WARNING"))
 
 
-def get_config():
+@lru_cache(maxsize=None)
+def _load_config() -> configparser.ConfigParser:
     config = configparser.ConfigParser()
     for config_filepath in CONFIG_FILEPATHS:
         LOGGER.debug("try reading config from %s", config_filepath)
         if not config_filepath:
             continue
 
-        config_filepath = Path(config_filepath).expanduser()
-        if not config_filepath.exists():
+        config_path = Path(config_filepath).expanduser()
+        if not config_path.exists():
             continue
 
-        config.read(config_filepath)
-        LOGGER.info("config loaded from %s", config_filepath)
+        config.read(config_path)
+        LOGGER.info("config loaded from %s", config_path)
         break
     else:
         raise FileNotFoundError("no config file was found")
     return config
 
 
+def get_config() -> configparser.ConfigParser:
+    """Return the configuration of the package.
+
+    The configuration file is looked for and read once per process: call
+    `clear_config_cache` to read it again. Each call returns its own copy of
+    the configuration, that can be modified without affecting the others.
+    """
+    loaded_config = _load_config()
+    config = configparser.ConfigParser()
+    config.read_dict({config.default_section: loaded_config.defaults()})
+    config.read_dict(
+        {
+            section: dict(loaded_config.items(section, raw=True))
+            for section in loaded_config.sections()
+        }
+    )
+    return config
+
+
+def clear_config_cache():
+    """Forget the configuration read by `get_config`"""
+    _load_config.cache_clear()
+
+
 def set_trig(m, values, part="upper"):
     """Set the `values` upper/lower `part` of the square matrix `m`"""
     part = part.lower()
@@ -78,7 +107,6 @@ def haversine(lon1, lat1, lon2, lat2):
     Calculate the great circle distance between two points
     on the earth (specified in decimal degrees)
     """
-    EARTH_RADIUS_METER = 6367e3
     lon1, lat1, lon2, lat2 = map(np.radians, [lon1, lat1, lon2, lat2])
 
     dlon = lon2 - lon1
@@ -49,6 +49,10 @@ install_requires = [
     "netCDF4 >= 1.6.0",
 ]
 
+extras_require = {
+    "async": ["aiohttp >= 3.8.0"],
+}
+
 classifiers = [
     "Development Status :: 5 - Production/Stable",
     "Intended Audience :: Science/Research",
@@ -94,10 +98,11 @@ setup(
     long_description=open("README.md", "r").read(),
     long_description_content_type="text/markdown",
     install_requires=install_requires,
+    extras_require=extras_require,
     classifiers=classifiers,
     keywords=keywords,
     url=url,
-    packages=find_packages(exclude=["test"]),
+    packages=find_packages(exclude=["test", "benchmarks"]),
     data_files=[("etc/resourcecode", ["config/config.ini"])],
     include_package_data=True,
     zip_safe=False,
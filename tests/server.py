@@ -0,0 +1,216 @@
+# coding: utf-8
+
+# Copyright 2020-2022 IFREMER (Brest, FRANCE), all rights reserved.
+# contact -- mailto:nicolas.raillard@ifremer.fr
+#
+# This file is part of Resourcecode.
+#
+# Resourcecode is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3.0 of the License, or any later version.
+#
+# Resourcecode is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along
+# with Resourcecode. If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import time
+import zlib
+import functools
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+
+from resourcecode.data import get_covered_period
+
+from . import DATA_DIR
+
+
+def load_timeseries(parameters):
+    """Mock the cassandra database.
+
+    Read the file of the requested parameter from the DATA_DIR directory, and
+    only keep the records between the requested start and end dates (None
+    dates are always kept). Return None if there is no data for the
+    requested parameter.
+    """
+    parameter = parameters.get("parameter", [None])[0]
+    start_date = parameters.get("start")
+    end_date = parameters.get("end")
+    data_path = DATA_DIR / f"timeseries_{parameter}.json"
+
+    if not data_path.exists():
+        return None
+
+    with open(data_path) as fobj:
+        data = json.load(fobj)
+
+    records = []
+    for date, value in data["result"]["data"]:
+        # start_date and end_date must be multiplied by 1e3, because
+        # cassandra returns milliseconds
+        if date is not None and (start_date is not None and date < start_date * 1e3):
+            continue
+
+        if date and end_date is not None and date > end_date * 1e3:
+            break
+
+        records.append([date, value])
+
+    data["result"]["data"] = records
+    return data
+
+
+def synthetic_timeseries(
+    parameter: str, start: float, end: float, time_step: float = 3600
+) -> bytes:
+    """Generate the json response of the cassandra database for a synthetic
+    time series of `parameter`, with a record every `time_step` seconds
+    between the `start` and `end` timestamps (in seconds).
+
+    The values are random, but the same for the same query. As in the real
+    database, about 1% of the records are null, and their timestamp too.
+    """
+    times = np.arange(np.ceil(start / time_step), end // time_step + 1) * time_step
+    seed = zlib.crc32(f"{parameter}/{start}/{end}/{time_step}".encode())
+    rng = np.random.default_rng(seed)
+    values = np.round(rng.gamma(2.0, 1.0, size=len(times)), 3)
+    missing = rng.random(len(times)) < 0.01
+
+    records = ",".join(
+        "[null,null]" if is_missing else f"[{int(time * 1e3)},{value}]"
+        for time, value, is_missing in zip(times, values, missing)
+    )
+    return (
+        '{"query":{"parameter":["%s"]},"result":{"dataSetSize":%d,"data":[%s]}}'
+        % (parameter, len(times), records)
+    ).encode()
+
+
+class TimeseriesRequestHandler(BaseHTTPRequestHandler):
+    """Answer the `api/timeseries` queries with `load_timeseries`"""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/api/timeseries":
+            self.send_error(404)
+            return
+
+        query = parse_qs(url.query)
+        parameters = {"parameter": query.get("parameter", [None])}
+        for key in ("start", "end"):
+            if key in query:
+                parameters[key] = float(query[key][0])
+
+        body = self.get_body(parameters)
+        if body is None:
+            self.send_error(500)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.statistics.add(len(body))
+
+    def get_body(self, parameters):
+        data = load_timeseries(parameters)
+        if data is None:
+            return None
+        return json.dumps(data).encode()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SyntheticTimeseriesRequestHandler(TimeseriesRequestHandler):
+    """Answer the `api/timeseries` queries with `synthetic_timeseries`, after
+    waiting `latency` seconds"""
+
+    latency = 0.0
+    time_step = 3600.0
+
+    def get_body(self, parameters):
+        time.sleep(self.latency)
+        covered_period = get_covered_period()
+        return _cached_synthetic_timeseries(
+            parameters["parameter"][0],
+            parameters.get("start", covered_period["start"].timestamp()),
+            parameters.get("end", covered_period["end"].timestamp()),
+            self.time_step,
+        )
+
+
+# the responses are generated once, so that the server does not slow down the
+# client it is used to benchmark.
+_cached_synthetic_timeseries = functools.lru_cache(maxsize=256)(synthetic_timeseries)
+
+
+class ServerStatistics:
+    """Count the requests answered by a server, and the bytes sent"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.bytes_sent = 0
+
+    def add(self, size: int):
+        with self._lock:
+            self.requests += 1
+            self.bytes_sent += size
+
+
+@contextmanager
+def _serve(handler_class):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler_class)
+    server.statistics = ServerStatistics()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/", server.statistics
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@contextmanager
+def timeseries_server():
+    """Run a local stand-in of the cassandra database, and yield its url"""
+    with _serve(TimeseriesRequestHandler) as (url, _):
+        yield url
+
+
+@contextmanager
+def synthetic_timeseries_server(latency: float = 0.0, time_step: float = 3600.0):
+    """Run a local stand-in of the cassandra database, answering any query
+    with synthetic data (see `synthetic_timeseries`).
+
+    Parameters
+    ----------
+    latency: float
+        the time the server waits before answering a query, in seconds.
+    time_step: float
+        the time between two records, in seconds. Use a smaller time step to
+        generate bigger responses.
+
+    Yield
+    -----
+    (url, statistics)
+        the url of the server, and the statistics of the requests it answered
+        (see `ServerStatistics`).
+    """
+    handler_class = type(
+        "Handler",
+        (SyntheticTimeseriesRequestHandler,),
+        {"latency": latency, "time_step": time_step},
+    )
+    with _serve(handler_class) as (url, statistics):
+        yield url, statistics
@@ -0,0 +1,107 @@
+# coding: utf-8
+
+# Copyright 2020-2022 IFREMER (Brest, FRANCE), all rights reserved.
+# contact -- mailto:nicolas.raillard@ifremer.fr
+#
+# This file is part of Resourcecode.
+#
+# Resourcecode is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3.0 of the License, or any later version.
+#
+# Resourcecode is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along
+# with Resourcecode. If not, see <https://www.gnu.org/licenses/>.
+
+import asyncio
+
+import pytest
+import pandas as pd
+
+import resourcecode
+from resourcecode.exceptions import BadPointIdError, BadParameterError
+
+from .server import timeseries_server
+
+pytest.importorskip("aiohttp")
+
+
+@pytest.fixture
+def server_url():
+    with timeseries_server() as url:
+        yield url
+
+
+def _client(client_class, server_url, **kwargs):
+    client = client_class(**kwargs)
+    client.config.set("default", "cassandra-base-url", server_url)
+    return client
+
+
+def test_async_client_is_equivalent_to_client(server_url):
+    start_date = "2017-01-01 00:00:00"
+    end_date = "2017-01-10 13:00:00"
+    parameters = ["uust", "fp", "hs", "tp"]
+
+    async def get_dataframes():
+        async with _client(
+            resourcecode.AsyncClient, server_url, max_workers=2
+        ) as client:
+            return await asyncio.gather(
+                client.get_dataframe(
+                    pointId=42,
+                    startDateTime=start_date,
+                    endDateTime=end_date,
+                    parameters=parameters,
+                ),
+                client.get_dataframe_from_url(
+                    f"https://fake-app.fr/?pointId=42&startDateTime={start_date}",
+                    parameters=parameters,
+                ),
+                client.get_dataframe_from_criteria({"parameter": parameters}),
+            )
+
+    data_from_args, data_from_url, data_from_criteria = asyncio.run(get_dataframes())
+
+    with _client(resourcecode.Client, server_url) as client:
+        pd.testing.assert_frame_equal(
+            data_from_args,
+            client.get_dataframe(
+                pointId=42,
+                startDateTime=start_date,
+                endDateTime=end_date,
+                parameters=parameters,
+            ),
+        )
+        pd.testing.assert_frame_equal(
+            data_from_url,
+            client.get_dataframe_from_url(
+                f"https://fake-app.fr/?pointId=42&startDateTime={start_date}",
+                parameters=parameters,
+            ),
+        )
+        pd.testing.assert_frame_equal(
+            data_from_criteria,
+            client.get_dataframe_from_criteria({"parameter": parameters}),
+        )
+    assert len(data_from_criteria) == 744
+
+
+def test_async_client_errors(server_url):
+    async def get_dataframe(**kwargs):
+        async with _client(resourcecode.AsyncClient, server_url) as client:
+            return await client.get_dataframe(**kwargs)
+
+    with pytest.raises(BadPointIdError):
+        asyncio.run(get_dataframe(pointId=328031))
+
+    with pytest.raises(BadParameterError):
+        asyncio.run(get_dataframe(pointId=1, parameters=["hs_max"]))
+
+    # the stand-in server has no data for this parameter
+    with pytest.raises(ValueError):
+        asyncio.run(get_dataframe(pointId=1, parameters=["dir"]))
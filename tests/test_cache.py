@@ -0,0 +1,149 @@
+# coding: utf-8
+
+# Copyright 2020-2022 IFREMER (Brest, FRANCE), all rights reserved.
+# contact -- mailto:nicolas.raillard@ifremer.fr
+#
+# This file is part of Resourcecode.
+#
+# Resourcecode is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3.0 of the License, or any later version.
+#
+# Resourcecode is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along
+# with Resourcecode. If not, see <https://www.gnu.org/licenses/>.
+
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from resourcecode.cache import (
+    TimeseriesCache,
+    _fill_missing_times,
+    _subtract_intervals,
+)
+
+
+def _series(start, end):
+    """an hourly series between start and end (in seconds), whose values are
+    the hour numbers"""
+    times = np.arange(start * 1e3, end * 1e3 + 1, 3600e3)
+    return np.column_stack((times, times / 3600e3))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return TimeseriesCache(tmp_path, max_size=2**20)
+
+
+def test_fill_missing_times():
+    times = np.array([np.nan, 3600e3, np.nan, 3 * 3600e3, np.nan])
+    np.testing.assert_array_equal(_fill_missing_times(times), np.arange(5) * 3600e3)
+
+
+def test_exact_and_sub_range_hits(cache):
+    series = _series(0, 100 * 3600)
+    assert cache.get(1, "hs", 0, 100 * 3600) is None
+
+    cache.put(1, "hs", 0, 100 * 3600, series)
+    np.testing.assert_array_equal(cache.get(1, "hs", 0, 100 * 3600), series)
+    np.testing.assert_array_equal(
+        cache.get(1, "hs", 10 * 3600, 20 * 3600), series[10:21]
+    )
+
+    # out of the cached range, or another key
+    assert cache.get(1, "hs", 0, 101 * 3600) is None
+    assert cache.get(2, "hs", 0, 100 * 3600) is None
+    assert cache.get(1, "fp", 0, 100 * 3600) is None
+
+
+def test_missing_timestamps_are_kept(cache):
+    series = _series(0, 10 * 3600)
+    series[0, 0] = np.nan
+    cache.put(1, "uust", 0, 10 * 3600, series)
+
+    cached = cache.get(1, "uust", 0, 10 * 3600)
+    assert np.isnan(cached[0, 0])
+    np.testing.assert_array_equal(cached[1:], series[1:])
+
+
+def test_contiguous_ranges_are_merged(cache):
+    cache.put(1, "hs", 0, 10 * 3600, _series(0, 10 * 3600))
+    cache.put(1, "hs", 10 * 3600 + 1, 20 * 3600, _series(11 * 3600, 20 * 3600))
+
+    np.testing.assert_array_equal(
+        cache.get(1, "hs", 5 * 3600, 15 * 3600), _series(5 * 3600, 15 * 3600)
+    )
+
+
+def test_ranges_one_hour_apart_are_not_merged(cache):
+    assert _subtract_intervals(0, 36000, [(0, 100), (3700, 36000)]) == [(101, 3699)]
+
+    cache.put(1, "hs", 0, 10 * 3600, _series(0, 10 * 3600))
+    cache.put(1, "hs", 11 * 3600, 20 * 3600, _series(11 * 3600, 20 * 3600))
+
+    # the record between the two ranges has never been fetched
+    assert cache.get(1, "hs", 5 * 3600, 15 * 3600) is None
+    assert cache.lookup(1, "hs", 0, 20 * 3600)[1] == [(10 * 3600 + 1, 11 * 3600 - 1)]
+
+
+def test_least_recently_used_eviction(tmp_path):
+    cache = TimeseriesCache(tmp_path / "size", max_size=2**20)
+    cache.put(1, "hs", 0, 10 * 3600, _series(0, 10 * 3600))
+    file_size = (tmp_path / "size" / "hs" / "1.parquet").stat().st_size
+
+    cache = TimeseriesCache(tmp_path, max_size=2 * file_size)
+    cache.put(1, "hs", 0, 10 * 3600, _series(0, 10 * 3600))
+    cache.put(2, "hs", 0, 10 * 3600, _series(0, 10 * 3600))
+    # reading the first series makes it the most recently used
+    assert cache.get(1, "hs", 0, 10 * 3600) is not None
+    cache.put(3, "hs", 0, 10 * 3600, _series(0, 10 * 3600))
+
+    assert cache.get(1, "hs", 0, 10 * 3600) is not None
+    assert cache.get(2, "hs", 0, 10 * 3600) is None
+    assert cache.get(3, "hs", 0, 10 * 3600) is not None
+
+    cache.clear()
+    assert cache.get(1, "hs", 0, 10 * 3600) is None
+
+
+def test_cached_files_are_listed_once(tmp_path):
+    cache = TimeseriesCache(tmp_path, max_size=2**20)
+    cache.put(1, "hs", 0, 10 * 3600, _series(0, 10 * 3600))
+    file_size = (tmp_path / "hs" / "1.parquet").stat().st_size
+
+    # the files of the directory are counted by a new cache
+    cache = TimeseriesCache(tmp_path, max_size=2 * file_size)
+    with mock.patch.object(cache, "_scan", wraps=cache._scan) as scan:
+        for node in range(2, 5):
+            cache.put(node, "hs", 0, 10 * 3600, _series(0, 10 * 3600))
+    assert scan.call_count == 1
+    assert sorted(path.name for path in (tmp_path / "hs").iterdir()) == [
+        "3.parquet",
+        "4.parquet",
+    ]
+    assert cache._size == 2 * file_size
+
+
+def test_lookup_missing_intervals(cache):
+    assert cache.lookup(1, "hs", 0, 100 * 3600)[1] == [(0, 100 * 3600)]
+
+    cache.put(1, "hs", 10 * 3600, 20 * 3600, _series(10 * 3600, 20 * 3600))
+    cache.put(1, "hs", 40 * 3600, 50 * 3600, _series(40 * 3600, 50 * 3600))
+
+    series = _series(0, 100 * 3600)
+    array, missing = cache.lookup(1, "hs", 0, 100 * 3600)
+    np.testing.assert_array_equal(array, np.concatenate((series[10:21], series[40:51])))
+    assert missing == [
+        (0, 10 * 3600 - 1),
+        (20 * 3600 + 1, 40 * 3600 - 1),
+        (50 * 3600 + 1, 100 * 3600),
+    ]
+
+    array, missing = cache.lookup(1, "hs", 12 * 3600, 45 * 3600)
+    assert missing == [(20 * 3600 + 1, 40 * 3600 - 1)]
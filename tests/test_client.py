@@ -18,75 +18,66 @@
 # with Resourcecode. If not, see <https://www.gnu.org/licenses/>.
 
 import json
+import time
+from configparser import ConfigParser
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest import mock
 from datetime import datetime
 
 import pytest
+import numpy as np
 import pandas as pd
 
 import resourcecode
-from resourcecode.exceptions import BadPointIdError, BadParameterError
+from resourcecode.client import (
+    TimeseriesDecoder,
+    _criteria_key,
+    _interpolate,
+    _split_time_range,
+    clear_metadata_cache,
+)
+from resourcecode.exceptions import BadPointIdError, BadParameterError, FetchError
 
 from . import DATA_DIR
+from .server import load_timeseries, synthetic_timeseries_server
 
 
-def mock_requests_get_raw_data(query_url, parameters):
-    """this function mocks the 'requests.get' call in the `_get_rawdata` method
-    of the Client.
+def mock_requests_get_raw_data(query_url, parameters, **kwargs):
+    """this function mocks the 'requests.Session.get' call in the `_fetch_array`
+    method of the Client.
 
-    it reads the parameters given `requests.get` call, opens the corresponding
+    it reads the parameters given `requests.Session.get` call, opens the corresponding
     file, and return a Response object. This Response object is a Mock, which
     has one attribute `ok` (True if a file has been read, False otherwise), and
-    one method `json`. Calling this method will return the content of the
-    requested file.
+    one method, `iter_content`, that yields the content of the requested file
+    by chunks of bytes.
     """
 
     mocked_response = mock.Mock()
-    parameter = parameters.get("parameter", [None])[0]
-    start_date = parameters.get("start")
-    end_date = parameters.get("end")
-    data_path = DATA_DIR / f"timeseries_{parameter}.json"
-
-    if not data_path.exists():
+    data = load_timeseries(parameters)
+    if data is None:
         mocked_response.ok = False
         return mocked_response
 
-    with open(data_path) as fobj:
-        data = json.load(fobj)
-        records = []
-        # mock cassandra:
-        # if date is None, return it.
-        # filter dates that are not between start and end dates
-        for date, value in data["result"]["data"]:
-            # start_date and end_date must be multiplied by 1e3, because
-            # cassandra returns milliseconds
-            if date is not None and (
-                start_date is not None and date < start_date * 1e3
-            ):
-                continue
-
-            if date and end_date is not None and date > end_date * 1e3:
-                break
-
-            records.append([date, value])
-
-        data["result"]["data"] = records
-        mocked_response.json.return_value = data
-
+    content = json.dumps(data).encode()
+    mocked_response.iter_content.side_effect = lambda chunk_size=1: (
+        content[i : i + chunk_size] for i in range(0, len(content), chunk_size)
+    )
     mocked_response.ok = True
     return mocked_response
 
 
 @pytest.fixture
 def client():
-    """This fixture returns a « fake client » in the sense that the requests.get
-    function is mocked to return a file from the DATA_DIR directory.
+    """This fixture returns a « fake client » in the sense that the
+    requests.Session.get function is mocked to return a file from the DATA_DIR directory.
 
     Except for that, this client is exactly as the "real" client.
 
     """
     client = resourcecode.Client()
-    with mock.patch("requests.get", side_effect=mock_requests_get_raw_data):
+    with mock.patch("requests.Session.get", side_effect=mock_requests_get_raw_data):
         yield client
 
 
@@ -100,7 +91,7 @@ def test_import_client():
 def test_unknown_parameters_and_pointid():
     client = resourcecode.Client()
 
-    with mock.patch("requests.get", side_effect=mock_requests_get_raw_data):
+    with mock.patch("requests.Session.get", side_effect=mock_requests_get_raw_data):
         assert not client.get_dataframe(
             pointId=1,
             parameters=[
@@ -135,28 +126,23 @@ def test_unknown_parameters_and_pointid():
         assert "hs_max" in str(excinfo.value)
 
 
-def test_get_raw_data():
+def test_fetch_array():
     parameter = "fp"
     client = resourcecode.Client()
 
     with mock.patch(
-        "requests.get", side_effect=mock_requests_get_raw_data
+        "requests.Session.get", side_effect=mock_requests_get_raw_data
     ) as mock_requests_get:
-        json_data = client._get_rawdata_from_criteria(
-            {
-                "parameter": [
-                    parameter,
-                ]
-            }
-        )
+        array = client._fetch_array({"parameter": [parameter]})
 
     mock_requests_get.assert_called_once_with(
-        client.cassandra_base_url + "api/timeseries", {"parameter": [parameter]}
+        client.cassandra_base_url + "api/timeseries",
+        {"parameter": [parameter]},
+        stream=True,
     )
-    assert json_data["query"]["parameterCode"] == parameter
-
-    dataset_size = json_data["result"]["dataSetSize"]
-    assert len(json_data["result"]["data"]) == dataset_size
+    json_data = load_timeseries({"parameter": [parameter]})
+    assert array.shape == (json_data["result"]["dataSetSize"], 2)
+    np.testing.assert_allclose(array, json_data["result"]["data"])
 
 
 def test_get_criteria_single_parameter(client):
@@ -250,3 +236,512 @@ def test_different_available_methods_to_get_data(client):
 
     assert (data_from_url == data_from_critera).all().bool()
     assert (data_from_args == data_from_critera).all().bool()
+
+
+def test_concurrent_and_sequential_fetches_are_equal():
+    criteria = '{"parameter": ["uust", "fp", "hs", "tp"]}'
+
+    with mock.patch(
+        "requests.Session.get", side_effect=mock_requests_get_raw_data
+    ) as mock_requests_get:
+        sequential_data = resourcecode.Client(
+            max_workers=1
+        ).get_dataframe_from_criteria(criteria)
+        concurrent_data = resourcecode.Client(
+            max_workers=4
+        ).get_dataframe_from_criteria(criteria)
+
+    # tp is computed from fp: fp is fetched once per client.
+    assert mock_requests_get.call_count == 6
+    assert (concurrent_data.columns == ["uust", "fp", "hs", "tp"]).all()
+    pd.testing.assert_frame_equal(sequential_data, concurrent_data)
+    np.testing.assert_allclose(concurrent_data.tp, 1 / concurrent_data.fp)
+
+
+def test_concurrent_identical_queries_are_coalesced():
+    released = threading.Event()
+
+    def slow_requests_get(query_url, parameters, **kwargs):
+        released.wait()
+        return mock_requests_get_raw_data(query_url, parameters, **kwargs)
+
+    client = resourcecode.Client()
+    with mock.patch(
+        "requests.Session.get", side_effect=slow_requests_get
+    ) as mock_requests_get:
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(client.get_dataframe, 42, parameters=["hs"])
+                for _ in range(3)
+            ]
+            while mock_requests_get.call_count == 0:
+                time.sleep(0.001)
+            time.sleep(0.2)
+            released.set()
+            dataframes = [future.result() for future in futures]
+
+        assert mock_requests_get.call_count == 1
+        assert not client._in_flight
+        for dataframe in dataframes[1:]:
+            pd.testing.assert_frame_equal(dataframe, dataframes[0])
+
+        # the query is sent again once the previous one is done
+        client.get_dataframe(42, parameters=["hs"])
+        assert mock_requests_get.call_count == 2
+
+
+def test_criteria_of_a_parameter_do_not_depend_on_the_others(client):
+    def hs_key(**criteria):
+        criteria_list = client._split_criteria(client._parse_criteria(criteria))
+        return _criteria_key(criteria_list[0])
+
+    start, end = datetime.fromisoformat("2010-01-01").timestamp(), 1262300400
+    assert (
+        hs_key(node=42, start=start, end=end, parameters=["hs"])
+        == hs_key(node=42, start=start, end=end, parameters=["hs", "tp"])
+        == hs_key(node=42, start=int(start), end=float(end), parameter=["hs", "fp"])
+    )
+
+
+def test_invalid_max_workers():
+    with pytest.raises(ValueError):
+        resourcecode.Client(max_workers=0)
+
+
+def test_session_is_reused_across_queries():
+    with mock.patch(
+        "requests.Session.get", side_effect=mock_requests_get_raw_data
+    ) as mock_session_get, resourcecode.Client(max_workers=2, pool_size=2) as client:
+        session = client.session
+        client.get_dataframe(pointId=42, parameters=["hs", "fp"])
+        client.get_dataframe_from_url(
+            "https://fake-app.fr/?pointId=42", parameters=("tp",)
+        )
+        client.get_dataframe_from_criteria('{"parameter": ["hs"]}')
+
+        assert client.session is session
+        assert mock_session_get.call_count == 4
+        adapter = session.get_adapter(client.cassandra_base_url)
+        assert adapter._pool_maxsize == 2
+
+
+def test_pool_size_defaults_to_max_workers():
+    with resourcecode.Client(max_workers=32) as client:
+        adapter = client.session.get_adapter(client.cassandra_base_url)
+        assert adapter._pool_maxsize == 32
+
+
+def test_session_compression():
+    with resourcecode.Client() as client:
+        assert "gzip" in client.session.headers["Accept-Encoding"]
+
+    with resourcecode.Client(compression=False) as client:
+        assert client.session.headers["Accept-Encoding"] == "identity"
+
+
+def test_cached_client(tmp_path):
+    criteria = {
+        "node": 42,
+        "start": datetime.fromisoformat("2017-01-01 00:00:00").timestamp(),
+        "end": datetime.fromisoformat("2017-01-31 23:00:00").timestamp(),
+        "parameter": ["uust", "fp"],
+    }
+    sub_criteria = {
+        **criteria,
+        "start": datetime.fromisoformat("2017-01-10 00:00:00").timestamp(),
+        "end": datetime.fromisoformat("2017-01-20 23:00:00").timestamp(),
+        "parameter": ["fp"],
+    }
+
+    with mock.patch(
+        "requests.Session.get", side_effect=mock_requests_get_raw_data
+    ) as mock_session_get:
+        client = resourcecode.Client(cache_dir=tmp_path)
+        data = client.get_dataframe_from_criteria(criteria)
+        sub_data = client.get_dataframe_from_criteria(sub_criteria)
+        assert mock_session_get.call_count == 2
+        assert len(sub_data) == 264
+
+        # the cache is kept between clients
+        cached_data = resourcecode.Client(
+            cache_dir=tmp_path
+        ).get_dataframe_from_criteria(criteria)
+        assert mock_session_get.call_count == 2
+
+        pd.testing.assert_frame_equal(data, cached_data)
+        pd.testing.assert_frame_equal(
+            sub_data, resourcecode.Client().get_dataframe_from_criteria(sub_criteria)
+        )
+        assert mock_session_get.call_count == 3
+
+
+def test_cached_client_fetches_missing_ranges_only(tmp_path):
+    start = datetime.fromisoformat("2017-01-01 00:00:00").timestamp()
+    middle = datetime.fromisoformat("2017-01-15 23:00:00").timestamp()
+    end = datetime.fromisoformat("2017-01-31 23:00:00").timestamp()
+    criteria = {"node": 42, "start": start, "end": end, "parameter": ["hs", "tp"]}
+
+    with mock.patch(
+        "requests.Session.get", side_effect=mock_requests_get_raw_data
+    ) as mock_session_get:
+        client = resourcecode.Client(cache_dir=tmp_path)
+        client.get_dataframe_from_criteria({**criteria, "end": middle})
+        assert mock_session_get.call_count == 2
+
+        data = client.get_dataframe_from_criteria(criteria)
+        assert mock_session_get.call_count == 4
+        for call in mock_session_get.call_args_list[2:]:
+            assert call.args[1]["start"] == middle + 1
+            assert call.args[1]["end"] == end
+
+        pd.testing.assert_frame_equal(
+            data, resourcecode.Client().get_dataframe_from_criteria(criteria)
+        )
+
+
+def test_get_dataframes(client):
+    dataframes, errors = client.get_dataframes(
+        [1, 42, 328031, "abc"], parameters=["hs", "tp"]
+    )
+
+    assert list(dataframes) == [1, 42]
+    assert set(errors) == {328031, "abc"}
+    assert all(isinstance(error, BadPointIdError) for error in errors.values())
+    pd.testing.assert_frame_equal(
+        dataframes[42], client.get_dataframe(pointId=42, parameters=["hs", "tp"])
+    )
+
+    data, errors = client.get_dataframes([1, 42], parameters=["hs"], concat=True)
+    assert not errors
+    assert data.index.names == ["pointId", None]
+    assert len(data) == 2 * 744
+    pd.testing.assert_frame_equal(data.loc[42], dataframes[42][["hs"]])
+
+    with pytest.raises(BadParameterError):
+        client.get_dataframes([1, 42], parameters=["hs_max"])
+
+
+def test_numpy_point_ids(client):
+    expected = client.get_dataframe(pointId=42, parameters=["hs"])
+    pd.testing.assert_frame_equal(
+        client.get_dataframe(pointId=np.int64(42), parameters=["hs"]), expected
+    )
+
+    dataframes, errors = client.get_dataframes(
+        np.array([1, 42], dtype=np.int64), parameters=["hs"]
+    )
+    assert not errors
+    assert list(dataframes) == [1, 42]
+    pd.testing.assert_frame_equal(dataframes[42], expected)
+
+
+def test_get_dataframes_with_failed_requests():
+    def failing_requests_get(query_url, parameters, **kwargs):
+        if parameters["node"] == 41:
+            raise ConnectionError("connection lost")
+        return mock_requests_get_raw_data(query_url, parameters, **kwargs)
+
+    client = resourcecode.Client(max_workers=3)
+    with mock.patch("requests.Session.get", side_effect=failing_requests_get):
+        dataframes, errors = client.get_dataframes([1, 42, 43], parameters=["hs"])
+
+    assert list(dataframes) == [1, 43]
+    assert list(errors) == [42]
+    assert isinstance(errors[42], ConnectionError)
+
+
+def unavailable_response(status_code=503):
+    mocked_response = mock.Mock()
+    mocked_response.ok = False
+    mocked_response.status_code = status_code
+    return mocked_response
+
+
+def test_transient_failures_are_retried():
+    failures = {"hs": 2, "fp": 1}
+
+    def flaky_requests_get(query_url, parameters, **kwargs):
+        parameter = parameters["parameter"][0]
+        if failures[parameter]:
+            failures[parameter] -= 1
+            return unavailable_response()
+        return mock_requests_get_raw_data(query_url, parameters, **kwargs)
+
+    client = resourcecode.Client(backoff_factor=0)
+    with mock.patch(
+        "requests.Session.get", side_effect=flaky_requests_get
+    ) as mock_session_get:
+        data = client.get_dataframe_from_criteria({"parameter": ["hs", "fp"]})
+
+    assert mock_session_get.call_count == 5
+    assert data.attrs["errors"] == {}
+    with mock.patch("requests.Session.get", side_effect=mock_requests_get_raw_data):
+        pd.testing.assert_frame_equal(
+            data, client.get_dataframe_from_criteria({"parameter": ["hs", "fp"]})
+        )
+
+
+def test_failed_parameters_are_reported(tmp_path):
+    def failing_requests_get(query_url, parameters, **kwargs):
+        if parameters["parameter"] == ["fp"]:
+            return unavailable_response()
+        return mock_requests_get_raw_data(query_url, parameters, **kwargs)
+
+    client = resourcecode.Client(retries=2, backoff_factor=0, cache_dir=tmp_path)
+    with mock.patch(
+        "requests.Session.get", side_effect=failing_requests_get
+    ) as mock_session_get:
+        data = client.get_dataframe_from_criteria({"parameter": ["hs", "fp"]})
+        assert mock_session_get.call_count == 1 + 3
+
+        # the parameters that succeeded are kept, and cached
+        assert list(data.columns) == ["hs"]
+        assert len(data) == 744
+        assert list(data.attrs["errors"]) == ["fp"]
+        assert isinstance(data.attrs["errors"]["fp"], FetchError)
+        assert "503" in str(data.attrs["errors"]["fp"])
+
+        with pytest.raises(FetchError):
+            client.get_dataframe_from_criteria({"parameter": ["fp"]})
+
+    with mock.patch(
+        "requests.Session.get", side_effect=mock_requests_get_raw_data
+    ) as mock_session_get:
+        data = client.get_dataframe_from_criteria({"parameter": ["hs", "fp"]})
+        assert mock_session_get.call_count == 1
+        assert list(data.columns) == ["hs", "fp"]
+
+
+def test_unretryable_failures():
+    def failing_requests_get(query_url, parameters, **kwargs):
+        return unavailable_response(status_code=404)
+
+    client = resourcecode.Client(backoff_factor=0)
+    with mock.patch(
+        "requests.Session.get", side_effect=failing_requests_get
+    ) as mock_session_get:
+        with pytest.raises(FetchError):
+            client.get_dataframe_from_criteria({"parameter": ["hs"]})
+        assert mock_session_get.call_count == 1
+
+    # no data is expected out of the hindcast period: an empty response is
+    # not retried.
+    client = resourcecode.Client(backoff_factor=0)
+    with mock.patch(
+        "requests.Session.get", side_effect=mock_requests_get_raw_data
+    ) as mock_session_get:
+        criteria = {
+            "parameter": ["hs"],
+            "start": datetime.fromisoformat("2030-01-01 00:00:00").timestamp(),
+            "end": datetime.fromisoformat("2030-01-31 23:00:00").timestamp(),
+        }
+        assert client.get_dataframe_from_criteria(criteria).empty
+        assert mock_session_get.call_count == 1
+
+
+def test_retry_delay():
+    client = resourcecode.Client(backoff_factor=0.5)
+    for attempt in range(1, 5):
+        delays = [client._retry_delay(attempt) for _ in range(100)]
+        assert all(0 <= delay <= 0.5 * 2 ** (attempt - 1) for delay in delays)
+
+    with pytest.raises(ValueError):
+        resourcecode.Client(retries=-1)
+
+
+def test_get_table(client):
+    criteria = {"node": 42, "parameter": ["hs", "fp", "tp"]}
+    table = client.get_table_from_criteria(criteria)
+
+    assert table.column_names == ["time", "hs", "fp", "tp"]
+    assert str(table.schema.field("time").type) == "timestamp[ms]"
+    assert json.loads(table.schema.metadata[b"errors"]) == {}
+    pd.testing.assert_frame_equal(
+        table.to_pandas().set_index("time").rename_axis(None),
+        client.get_dataframe_from_criteria(criteria),
+        check_index_type=False,
+    )
+    assert table.equals(
+        client.get_table(pointId=42, parameters=["hs", "fp", "tp"]),
+    )
+
+    client.dtype = "int16"
+    table = client.get_table_from_criteria(criteria)
+    assert str(table.schema.field("hs").type) == "int16"
+    assert table.schema.field("hs").metadata == {
+        b"scale_factor": b"0.002",
+        b"add_offset": b"0.0",
+    }
+    assert str(table.schema.field("tp").type) == "float"
+
+    # the missing timestamps are nulls
+    table = client.get_table_from_criteria({"parameter": ["uust"]})
+    assert table["time"].null_count > 0
+    assert table["time"].null_count == table.to_pandas()["time"].isna().sum()
+
+
+def test_synthetic_server():
+    start = datetime.fromisoformat("2010-01-01 00:00:00")
+    end = datetime.fromisoformat("2011-12-31 23:00:00")
+
+    with synthetic_timeseries_server(latency=0.01) as (url, statistics):
+        client = resourcecode.Client(rate_limit=0)
+        client.config.set("default", "cassandra-base-url", url)
+        with client:
+            data = client.get_dataframe(42, start, end, ["hs", "tp", "wspd"])
+            same_data = client.get_dataframe(42, start, end, ["hs", "tp", "wspd"])
+
+    # hs, fp, uwnd and vwnd, twice
+    assert statistics.requests == 8
+    assert statistics.bytes_sent > 0
+    assert len(data) == 2 * 365 * 24
+    assert data.hs.notna().mean() > 0.95
+    pd.testing.assert_frame_equal(data, same_data)
+
+
+def test_interpolate():
+    index = pd.date_range("2020-01-01", periods=3, freq="h")
+    dataframes = [
+        pd.DataFrame({"hs": [1.0, 2.0, 3.0], "dir": [350.0, 90.0, 0.0]}, index),
+        pd.DataFrame({"hs": [3.0, 4.0, 5.0], "dir": [10.0, 180.0, 0.0]}, index),
+        pd.DataFrame({"hs": [5.0, 1.0], "dir": [0.0, 0.0]}, index[[0, 2]]),
+    ]
+    interpolated = _interpolate(dataframes, np.array([0.25, 0.25, 0.5]))
+
+    np.testing.assert_allclose(interpolated.hs, [3.5, np.nan, 2.5])
+    # 350° and 10° average to north, not south
+    np.testing.assert_allclose(np.cos(np.radians(interpolated.dir.iloc[[0, 2]])), 1)
+    assert np.isnan(interpolated.dir.iloc[1])
+
+
+def test_get_interpolated_dataframe():
+    start = datetime.fromisoformat("2010-01-01 00:00:00")
+    end = datetime.fromisoformat("2010-03-31 23:00:00")
+
+    with synthetic_timeseries_server() as (url, statistics):
+        client = resourcecode.Client(rate_limit=0)
+        client.config.set("default", "cassandra-base-url", url)
+        with client:
+            data = client.get_interpolated_dataframe(
+                48.3, -4.5, start, end, ["hs", "dp"]
+            )
+            node_data = client.get_dataframe(
+                data.attrs["points"][0], start, end, ["hs", "dp"]
+            )
+            with pytest.raises(ValueError, match="outside of the mesh"):
+                client.get_interpolated_dataframe(-60, -60, start, end)
+
+    # the synthetic server returns the same data for all the points: the
+    # interpolation gives them back.
+    assert statistics.requests == 2 * 3 + 2
+    assert len(data.attrs["points"]) == 3
+    assert sum(data.attrs["weights"]) == pytest.approx(1)
+    assert data.attrs["errors"] == {}
+    pd.testing.assert_frame_equal(data, node_data, check_like=True, atol=1e-9)
+
+
+def test_metadata_are_cached_across_clients():
+    resourcecode.Client()
+
+    with mock.patch("pandas.read_feather") as read_feather, mock.patch(
+        "configparser.ConfigParser.read"
+    ) as read_config:
+        first_client = resourcecode.Client()
+        second_client = resourcecode.Client()
+        assert read_feather.call_count == 0
+        assert read_config.call_count == 0
+
+    assert first_client.possible_points_id is second_client.possible_points_id
+
+    # each client has its own copy of the configuration
+    first_client.config.set("default", "cassandra-base-url", "http://localhost/")
+    assert second_client.cassandra_base_url != "http://localhost/"
+    assert resourcecode.Client().cassandra_base_url != "http://localhost/"
+
+    clear_metadata_cache()
+    with mock.patch(
+        "configparser.ConfigParser.read", side_effect=ConfigParser.read, autospec=True
+    ) as read_config:
+        client = resourcecode.Client()
+        assert read_config.call_count == 1
+    assert client.possible_points_id == first_client.possible_points_id
+
+
+def test_split_time_range():
+    start = datetime.fromisoformat("2016-06-01 00:00:00").timestamp()
+    end = datetime.fromisoformat("2018-06-01 00:00:00").timestamp()
+    year_2017 = datetime.fromisoformat("2017-01-01 00:00:00").timestamp()
+    year_2018 = datetime.fromisoformat("2018-01-01 00:00:00").timestamp()
+
+    assert _split_time_range(start, end) == [(start, end)]
+    assert _split_time_range(start, end, "YS") == [
+        (start, year_2017 - 1),
+        (year_2017, year_2018 - 1),
+        (year_2018, end),
+    ]
+
+
+def test_chunked_extraction(tmp_path):
+    criteria = {
+        "node": 42,
+        "start": datetime.fromisoformat("2017-01-01 00:00:00").timestamp(),
+        "end": datetime.fromisoformat("2017-01-31 23:00:00").timestamp(),
+        "parameter": ["hs", "tp"],
+    }
+
+    with mock.patch(
+        "requests.Session.get", side_effect=mock_requests_get_raw_data
+    ) as mock_session_get:
+        data = resourcecode.Client().get_dataframe_from_criteria(criteria)
+        assert mock_session_get.call_count == 2
+
+        chunked_data = resourcecode.Client(
+            chunk_frequency="7D"
+        ).get_dataframe_from_criteria(criteria)
+        assert mock_session_get.call_count == 2 + 2 * 5
+
+        cached_chunked_data = resourcecode.Client(
+            chunk_frequency="7D", cache_dir=tmp_path
+        ).get_dataframe_from_criteria(criteria)
+
+    pd.testing.assert_frame_equal(data, chunked_data)
+    pd.testing.assert_frame_equal(data, cached_chunked_data)
+
+    with pytest.raises(ValueError):
+        resourcecode.Client(chunk_frequency="every other day")
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000, 10**6])
+@pytest.mark.parametrize("parameter", ["fp", "uust"])
+def test_timeseries_decoder(parameter, chunk_size):
+    content = (DATA_DIR / f"timeseries_{parameter}.json").read_bytes()
+    expected = np.array(json.loads(content)["result"]["data"], dtype=float)
+
+    decoder = TimeseriesDecoder()
+    for i in range(0, len(content), chunk_size):
+        decoder.feed(content[i : i + chunk_size])
+
+    np.testing.assert_array_equal(decoder.result(), expected)
+
+
+def test_timeseries_decoder_edge_cases():
+    def decode(content):
+        decoder = TimeseriesDecoder()
+        decoder.feed(content)
+        return decoder.result()
+
+    assert decode(b'{"result": {"dataSetSize": 0, "data": []}}').shape == (0, 2)
+
+    # the announced dataSetSize is wrong, or missing
+    for content in (
+        b'{"result": {"dataSetSize": 1, "data": [[1, 2.5], [2, null]]}}',
+        b'{"result": {"dataSetSize": 5, "data": [[1, 2.5], [2, null]]}}',
+        b'{"result": {"data": [[1, 2.5], [2, null]]}}',
+    ):
+        np.testing.assert_array_equal(decode(content), [[1, 2.5], [2, np.nan]])
+
+    with pytest.raises(ValueError):
+        decode(b'{"result": {"dataSetSize": 2, "data": [[1, 2.5], [2')
+
+    with pytest.raises(ValueError):
+        decode(b'{"errorcode": 1, "errormessage": "failure"}')
@@ -17,14 +17,41 @@
 # You should have received a copy of the GNU General Public License along
 # with Resourcecode. If not, see <https://www.gnu.org/licenses/>.
 
+import numpy as np
+import pandas as pd
+import pytest
+
 from resourcecode import (
+    get_closest_point,
+    get_closest_points,
+    get_closest_station,
+    get_closest_stations,
     get_coastline,
+    get_distance_to_coast,
+    get_grid_distance_to_coast,
     get_grid_field,
     get_grid_spec,
+    get_interpolation_weights,
     get_islands,
+    get_mesh_adjacency,
+    get_mesh_components,
+    get_neighbours,
+    get_points_in_bbox,
+    get_points_in_polygon,
+    get_points_in_radius,
+    get_shortest_path,
     get_triangles,
     get_variables,
 )
+from resourcecode.exceptions import BadPointIdError
+from resourcecode.data import (
+    DATA_DIR,
+    _get_spatial_index,
+    _locate,
+    _read_table,
+    clear_cache,
+)
+from resourcecode.utils import haversine
 
 
 def _check_loader(loader, expected_columns):
@@ -51,3 +78,318 @@ def test_load_data():
     _check_loader(get_islands, ["longitude", "latitude", "depth", "ID"])
     _check_loader(get_triangles, ["Corner 1", "Corner 2", "Corner 3"])
     _check_loader(get_variables, ["name", "longname", "unit"])
+
+
+def test_loaders_are_cached():
+    clear_cache()
+    grid = get_grid_field()
+    pd.testing.assert_frame_equal(
+        grid, pd.read_feather(DATA_DIR / "grid_FIELD.feather")
+    )
+
+    # the file is read once, and the dataframes share the cached data
+    other_grid = get_grid_field()
+    assert _read_table.cache_info().misses == 1
+    assert np.shares_memory(grid.latitude.to_numpy(), other_grid.latitude.to_numpy())
+    with pytest.raises(ValueError, match="read-only"):
+        grid.loc[0, "latitude"] = 0
+    assert (get_grid_field().columns == grid.columns).all()
+
+    # columns can still be selected, and new ones assigned
+    nodes = get_grid_field(columns=["node"])
+    assert list(nodes.columns) == ["node"]
+    nodes["other"] = 1
+
+    clear_cache()
+    assert _read_table.cache_info().currsize == 0
+    assert not np.shares_memory(
+        grid.latitude.to_numpy(), get_grid_field().latitude.to_numpy()
+    )
+
+
+def _brute_force_closest(dataset, latitude, longitude, returned_attribute):
+    distances = haversine(dataset.longitude, dataset.latitude, longitude, latitude)
+    min_idx = distances.idxmin()
+    return dataset.loc[min_idx, returned_attribute], distances[min_idx].round(2)
+
+
+@pytest.mark.parametrize(
+    "loader,function,returned_attribute",
+    [
+        (get_grid_field, get_closest_point, "node"),
+        (get_grid_spec, get_closest_station, "name"),
+    ],
+)
+def test_get_closest_matches_brute_force(loader, function, returned_attribute):
+    dataset = loader()
+    rng = np.random.default_rng(0)
+    latitudes = rng.uniform(dataset.latitude.min(), dataset.latitude.max(), 50)
+    longitudes = rng.uniform(dataset.longitude.min(), dataset.longitude.max(), 50)
+
+    for latitude, longitude in zip(latitudes, longitudes):
+        assert function(latitude, longitude) == _brute_force_closest(
+            dataset, latitude, longitude, returned_attribute
+        )
+
+
+def test_get_closest_on_a_node():
+    dataset = get_grid_spec()
+    station = dataset.iloc[10]
+    assert get_closest_station(station.latitude, station.longitude) == (
+        station["name"],
+        0,
+    )
+
+
+def test_spatial_index_is_built_once():
+    _get_spatial_index.cache_clear()
+    get_closest_point(48.3, -4.5)
+    get_closest_point(47.0, -3.0)
+    get_closest_station(48.3, -4.5)
+
+    cache_info = _get_spatial_index.cache_info()
+    assert cache_info.misses == 2
+    assert cache_info.hits == 1
+
+
+def test_get_closest_points_matches_single_lookups():
+    rng = np.random.default_rng(1)
+    latitudes = rng.uniform(43, 51, 100)
+    longitudes = rng.uniform(-8, 0, 100)
+
+    nodes, distances = get_closest_points(latitudes, longitudes)
+    assert nodes.shape == distances.shape == (100,)
+    expected = [get_closest_point(*position) for position in zip(latitudes, longitudes)]
+    assert list(zip(nodes, distances)) == expected
+
+    names, distances = get_closest_stations(latitudes, longitudes)
+    expected = [
+        get_closest_station(*position) for position in zip(latitudes, longitudes)
+    ]
+    assert list(zip(names, distances)) == expected
+
+
+def test_get_closest_points_k_nearest():
+    dataset = get_grid_field()
+    latitudes, longitudes = np.array([48.3, 47.0]), np.array([-4.5, -3.0])
+
+    nodes, distances = get_closest_points(latitudes, longitudes, k=4)
+    assert nodes.shape == distances.shape == (2, 4)
+    assert (np.diff(distances, axis=1) >= 0).all()
+    for i, (latitude, longitude) in enumerate(zip(latitudes, longitudes)):
+        all_distances = haversine(
+            dataset.longitude, dataset.latitude, longitude, latitude
+        ).round(2)
+        expected = all_distances.sort_values().iloc[:4]
+        np.testing.assert_array_equal(distances[i], expected)
+        np.testing.assert_array_equal(nodes[i], dataset.node[expected.index])
+
+
+def test_get_closest_points_invalid_arguments():
+    with pytest.raises(ValueError, match="same shape"):
+        get_closest_points([48.3, 47.0], [-4.5])
+    with pytest.raises(ValueError, match="k must be"):
+        get_closest_points([48.3], [-4.5], k=0)
+
+
+def test_get_interpolation_weights():
+    grid = get_grid_field().set_index("node")
+    rng = np.random.default_rng(2)
+    latitudes = rng.uniform(45, 50, (10, 20))
+    longitudes = rng.uniform(-6, -1, (10, 20))
+
+    point_ids, weights = get_interpolation_weights(latitudes, longitudes)
+    assert point_ids.shape == weights.shape == (10, 20, 3)
+    assert (point_ids > 0).all()
+    assert (weights >= 0).all()
+    np.testing.assert_allclose(weights.sum(axis=-1), 1)
+
+    # the weights give back the position from the corners of the triangles
+    for coordinate, expected in (("longitude", longitudes), ("latitude", latitudes)):
+        corners = grid[coordinate].to_numpy()[point_ids - 1]
+        np.testing.assert_allclose((weights * corners).sum(axis=-1), expected)
+
+    # on a corner, its weight is 1
+    triangle = get_triangles().iloc[0]
+    corner = grid.loc[triangle["Corner 2"]]
+    point_ids, weights = get_interpolation_weights(corner.latitude, corner.longitude)
+    assert point_ids.shape == (3,)
+    np.testing.assert_allclose(weights[point_ids == triangle["Corner 2"]], 1)
+
+    point_ids, weights = get_interpolation_weights([-60.0], [-60.0])
+    assert (point_ids == -1).all()
+    assert np.isnan(weights).all()
+
+
+def test_locate_without_the_closest_triangles():
+    rng = np.random.default_rng(3)
+    latitudes = np.append(rng.uniform(40, 64, 500), [np.nan, 90])
+    longitudes = np.append(rng.uniform(-14, 12, 500), [0, np.nan])
+
+    # with a single candidate, most positions are found in the grid of cells
+    triangles, weights = _locate(latitudes, longitudes)
+    single_triangles, single_weights = _locate(latitudes, longitudes, candidates=1)
+    assert 0 < (triangles >= 0).sum() < len(triangles) - 2
+    assert (triangles[-2:] == -1).all()
+    np.testing.assert_array_equal(single_triangles < 0, triangles < 0)
+    np.testing.assert_allclose(single_weights, weights, atol=1e-6)
+
+
+@pytest.mark.parametrize(
+    "loader,grid,returned_attribute",
+    [(get_grid_field, "field", "node"), (get_grid_spec, "spec", "name")],
+)
+def test_get_points_in_regions(loader, grid, returned_attribute):
+    dataset = loader()
+
+    selected = get_points_in_bbox(47.75, -5.25, 48.75, -4.25, grid=grid)
+    expected = dataset.query(
+        "latitude >= 47.75 and latitude <= 48.75 "
+        "and longitude >= -5.25 and longitude <= -4.25"
+    )
+    assert len(selected) > 0
+    np.testing.assert_array_equal(selected, expected[returned_attribute])
+
+    # a point on the edge of the box is selected
+    point = dataset.iloc[0]
+    selected = get_points_in_bbox(
+        point.latitude, point.longitude, point.latitude + 1, point.longitude + 1, grid
+    )
+    assert point[returned_attribute] in selected
+
+    # the vertices are away from the regular spacing of the grids, so that no
+    # point lies on the edges of the triangle.
+    selected = get_points_in_polygon(
+        [47.0137, 48.99, 48.99], [-4.99, -4.99, -3.0137], grid=grid
+    )
+    expected = dataset.query(
+        "latitude < 48.99 and longitude > -4.99 and longitude - latitude < -52.0037"
+    )
+    np.testing.assert_array_equal(selected, expected[returned_attribute])
+
+    selected = get_points_in_radius(48.3, -4.5, 50e3, grid=grid)
+    distances = haversine(dataset.longitude, dataset.latitude, -4.5, 48.3)
+    assert len(selected) > 0
+    np.testing.assert_array_equal(
+        selected, dataset[returned_attribute][distances <= 50e3]
+    )
+
+
+def test_get_points_in_regions_edge_cases():
+    assert len(get_points_in_bbox(48.75, -5.25, 47.75, -4.25)) == 0
+    assert len(get_points_in_radius(48.3, -4.5, 0)) == 0
+    assert len(get_points_in_radius(48.3, -4.5, 1e8)) == len(get_grid_field())
+    with pytest.raises(ValueError, match="grid must be"):
+        get_points_in_bbox(47.75, -5.25, 48.75, -4.25, grid="other")
+    with pytest.raises(ValueError, match="3 vertices"):
+        get_points_in_polygon([47, 49], [-5, -5])
+
+
+def test_mesh_adjacency():
+    grid = get_grid_field()
+    triangles = get_triangles()
+    adjacency = get_mesh_adjacency()
+
+    assert adjacency.shape == (len(grid), len(grid))
+    assert (adjacency != adjacency.T).nnz == 0
+
+    corner_1, corner_2, _ = triangles.iloc[0]
+    assert adjacency[corner_1 - 1, corner_2 - 1] == pytest.approx(
+        haversine(
+            grid.longitude[corner_1 - 1],
+            grid.latitude[corner_1 - 1],
+            grid.longitude[corner_2 - 1],
+            grid.latitude[corner_2 - 1],
+        )
+    )
+
+    # the edges are the ones of the triangles
+    corners = triangles.to_numpy().astype(np.int64)
+    edges = np.concatenate([corners[:, [0, 1]], corners[:, [1, 2]], corners[:, [2, 0]]])
+    edges.sort(axis=1)
+    rows, columns = (indexes.astype(np.int64) + 1 for indexes in adjacency.nonzero())
+    upper = rows < columns
+    np.testing.assert_array_equal(
+        np.unique(rows[upper] * len(grid) + columns[upper]),
+        np.unique(edges[:, 0] * len(grid) + edges[:, 1]),
+    )
+
+
+def test_get_neighbours():
+    adjacency = get_mesh_adjacency()
+    first_ring = get_neighbours(42)
+    np.testing.assert_array_equal(first_ring, adjacency[41].indices + 1)
+
+    second_ring = get_neighbours(42, rings=2)
+    expected = set(get_neighbours(first_ring)) | set(first_ring)
+    expected.discard(42)
+    assert set(second_ring) == expected
+
+    assert set(get_neighbours([42, 43])) == (
+        set(first_ring) | set(get_neighbours(43))
+    ) - {42, 43}
+    with pytest.raises(BadPointIdError):
+        get_neighbours(0)
+
+
+def test_mesh_components_and_paths():
+    labels = get_mesh_components()
+    assert len(labels) == len(get_grid_field())
+
+    path, length = get_shortest_path(1, 1000)
+    assert path[0] == 1 and path[-1] == 1000
+    assert labels[0] == labels[999]
+    adjacency = get_mesh_adjacency()
+    steps = [adjacency[start - 1, end - 1] for start, end in zip(path, path[1:])]
+    assert all(step > 0 for step in steps)
+    assert sum(steps) == pytest.approx(length)
+
+    path, length = get_shortest_path(42, 42)
+    assert list(path) == [42] and length == 0
+
+
+def test_get_distance_to_coast():
+    coastline = get_coastline()
+    islands = get_islands()
+
+    # on a vertex, and in the middle of a segment of the coastline
+    vertex = coastline.iloc[100]
+    assert get_distance_to_coast(vertex.latitude, vertex.longitude) == 0
+    start, end = coastline.iloc[100], coastline.iloc[101]
+    distance = get_distance_to_coast(
+        (start.latitude + end.latitude) / 2, (start.longitude + end.longitude) / 2
+    )
+    assert (
+        distance
+        < haversine(start.longitude, start.latitude, end.longitude, end.latitude) / 100
+    )
+
+    # never farther than the closest vertex, nor closer than it minus half of
+    # the longest segment (0.25°)
+    rng = np.random.default_rng(3)
+    latitudes = rng.uniform(43, 51, (5, 20))
+    longitudes = rng.uniform(-8, 0, (5, 20))
+    distances = get_distance_to_coast(latitudes, longitudes)
+    assert distances.shape == (5, 20)
+
+    vertices = pd.concat([coastline, islands])
+    for latitude, longitude, distance in zip(
+        latitudes.ravel()[:20], longitudes.ravel()[:20], distances.ravel()[:20]
+    ):
+        closest_vertex = haversine(
+            vertices.longitude, vertices.latitude, longitude, latitude
+        ).min()
+        assert distance <= closest_vertex + 1e-6
+        assert distance >= closest_vertex - 14e3
+
+
+def test_get_grid_distance_to_coast():
+    grid = get_grid_field()
+    distances = get_grid_distance_to_coast()
+    assert distances.shape == (len(grid),)
+    assert not distances.flags.writeable
+    assert get_grid_distance_to_coast() is distances
+    np.testing.assert_array_equal(
+        distances[:100],
+        get_distance_to_coast(grid.latitude[:100], grid.longitude[:100]),
+    )
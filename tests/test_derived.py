@@ -0,0 +1,84 @@
+# coding: utf-8
+
+# Copyright 2020-2022 IFREMER (Brest, FRANCE), all rights reserved.
+# contact -- mailto:nicolas.raillard@ifremer.fr
+#
+# This file is part of Resourcecode.
+#
+# Resourcecode is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3.0 of the License, or any later version.
+#
+# Resourcecode is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along
+# with Resourcecode. If not, see <https://www.gnu.org/licenses/>.
+
+from unittest import mock
+
+import pytest
+import numpy as np
+
+import resourcecode
+from resourcecode.client import BaseClient
+from resourcecode.derived import (
+    DERIVED_PARAMETERS,
+    get_sources,
+    register_derived_parameter,
+)
+from resourcecode.utils import zmcomp2metconv
+
+from .test_client import mock_requests_get_raw_data
+
+
+@pytest.fixture
+def hs_squared():
+    register_derived_parameter("hs2", ["hs"], lambda hs: hs**2)
+    yield
+    del DERIVED_PARAMETERS["hs2"]
+
+
+def test_get_sources():
+    assert get_sources(["hs", "tp", "fp"]) == ["hs", "fp"]
+    assert get_sources(["wspd", "wdir", "hs"]) == ["uwnd", "vwnd", "hs"]
+
+    with pytest.raises(ValueError):
+        register_derived_parameter("tp2", ["tp"], lambda tp: tp**2)
+
+
+def test_wind_speed_and_direction():
+    times = np.arange(10) * 3600e3
+    u = np.linspace(-5, 5, 10)
+    v = np.linspace(3, -7, 10)
+
+    data = BaseClient._build_dataframe(
+        ["wspd", "wdir", "uwnd"],
+        {
+            "uwnd": np.column_stack((times, u)),
+            "vwnd": np.column_stack((times, v)),
+        },
+    )
+
+    speed, direction = zmcomp2metconv(u, v)
+    assert list(data.columns) == ["wspd", "wdir", "uwnd"]
+    np.testing.assert_allclose(data.wspd, speed)
+    np.testing.assert_allclose(data.wdir, direction)
+    np.testing.assert_allclose(data.uwnd, u)
+
+
+def test_sources_are_fetched_once(hs_squared):
+    client = resourcecode.Client()
+    with mock.patch(
+        "requests.Session.get", side_effect=mock_requests_get_raw_data
+    ) as mock_requests_get:
+        data = client.get_dataframe_from_criteria(
+            {"parameter": ["hs2", "tp", "hs", "fp"]}
+        )
+
+    assert mock_requests_get.call_count == 2
+    assert list(data.columns) == ["hs2", "tp", "hs", "fp"]
+    np.testing.assert_allclose(data.hs2, data.hs**2)
+    np.testing.assert_allclose(data.tp, 1 / data.fp)
@@ -0,0 +1,117 @@
+# coding: utf-8
+
+# Copyright 2020-2022 IFREMER (Brest, FRANCE), all rights reserved.
+# contact -- mailto:nicolas.raillard@ifremer.fr
+#
+# This file is part of Resourcecode.
+#
+# Resourcecode is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3.0 of the License, or any later version.
+#
+# Resourcecode is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along
+# with Resourcecode. If not, see <https://www.gnu.org/licenses/>.
+
+from unittest import mock
+
+import pytest
+import numpy as np
+import pandas as pd
+import xarray
+
+import resourcecode
+from resourcecode.dtypes import get_int16_packing, pack_int16, unpack
+from resourcecode.resassess import exceed, univar_monstats
+
+from .test_client import mock_requests_get_raw_data
+
+CRITERIA = {"node": 42, "parameter": ["hs", "fp", "tp"]}
+
+
+@pytest.fixture
+def float64_data():
+    with mock.patch("requests.Session.get", side_effect=mock_requests_get_raw_data):
+        return resourcecode.Client().get_dataframe_from_criteria(CRITERIA)
+
+
+def test_float32(float64_data):
+    client = resourcecode.Client(dtype="float32")
+    with mock.patch("requests.Session.get", side_effect=mock_requests_get_raw_data):
+        data = client.get_dataframe_from_criteria(CRITERIA)
+
+    assert (data.dtypes == np.float32).all()
+    assert data.memory_usage(index=False).sum() == (
+        float64_data.memory_usage(index=False).sum() / 2
+    )
+    pd.testing.assert_frame_equal(data, float64_data, check_dtype=False, rtol=1e-6)
+
+    # the float32 columns are not upcast by the downstream modules
+    assert data.resample("1D").max().dtypes.eq(np.float32).all()
+    assert exceed(data.hs)[0].dtype == np.float32
+    _, monthly_statistics, _ = univar_monstats(data, "hs")
+    np.testing.assert_allclose(
+        monthly_statistics["mean"],
+        univar_monstats(float64_data, "hs")[1]["mean"],
+        rtol=1e-6,
+    )
+
+
+def test_int16(float64_data):
+    client = resourcecode.Client(dtype="int16")
+    with mock.patch("requests.Session.get", side_effect=mock_requests_get_raw_data):
+        data = client.get_dataframe_from_criteria(CRITERIA)
+
+    assert data.hs.dtype == "Int16"
+    assert data.fp.dtype == "Int16"
+    # tp is not stored in the hindcast: it can't be packed
+    assert data.tp.dtype == np.float32
+    assert set(data.attrs["packing"]) == {"hs", "fp"}
+
+    unpacked = unpack(data)
+    assert "packing" not in unpacked.attrs
+    assert (unpacked.dtypes == np.float32).all()
+    for parameter in ["hs", "fp"]:
+        scale_factor, _ = get_int16_packing(parameter)
+        np.testing.assert_allclose(
+            unpacked[parameter], float64_data[parameter], atol=scale_factor / 2
+        )
+
+
+def test_pack_int16():
+    values = np.array([0.0, 1.2345, np.nan, -1e9, 1e9])
+    packed = pack_int16(values, 0.001, 0.0)
+
+    assert packed.dtype == "Int16"
+    assert packed[2] is pd.NA
+    assert list(packed[[0, 1, 3, 4]]) == [0, 1234, -32766, 32767]
+
+
+def test_invalid_dtype():
+    with pytest.raises(ValueError):
+        resourcecode.Client(dtype="float16")
+
+
+def test_int16_netcdf_export(float64_data, tmp_path):
+    client = resourcecode.Client(dtype="int16")
+    with mock.patch("requests.Session.get", side_effect=mock_requests_get_raw_data):
+        data = client.get_dataframe_from_criteria(CRITERIA)
+
+    data.to_netcdf(tmp_path / "data.nc")
+    exported = pd.read_netcdf(tmp_path / "data.nc")
+    for parameter in ["hs", "fp"]:
+        scale_factor, _ = get_int16_packing(parameter)
+        np.testing.assert_allclose(
+            exported[parameter], float64_data[parameter], atol=scale_factor / 2
+        )
+    np.testing.assert_allclose(exported.tp, float64_data.tp, rtol=1e-6)
+
+    # the packed values are written as they are
+    with xarray.open_dataset(tmp_path / "data.nc", mask_and_scale=False) as dataset:
+        np.testing.assert_array_equal(
+            dataset.hs, data.hs.to_numpy(dtype="int16", na_value=-32767)
+        )
@@ -0,0 +1,79 @@
+# coding: utf-8
+
+# Copyright 2020-2022 IFREMER (Brest, FRANCE), all rights reserved.
+# contact -- mailto:nicolas.raillard@ifremer.fr
+#
+# This file is part of Resourcecode.
+#
+# Resourcecode is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3.0 of the License, or any later version.
+#
+# Resourcecode is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along
+# with Resourcecode. If not, see <https://www.gnu.org/licenses/>.
+
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.benchmark_import import HEAVY_MODULES, imported_modules
+
+
+def test_import_does_not_load_heavy_dependencies():
+    assert imported_modules("resourcecode", HEAVY_MODULES) == []
+
+
+@pytest.mark.parametrize(
+    "attribute,module",
+    [
+        ("Client", "requests"),
+        ("get_closest_point", "resourcecode.data"),
+        ("spectrum", "resourcecode.spectrum"),
+    ],
+)
+def test_attributes_are_loaded_on_first_access(attribute, module):
+    code = (
+        "import sys; import resourcecode; "
+        f"assert {module!r} not in sys.modules; "
+        f"resourcecode.{attribute}; "
+        f"assert {module!r} in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+@pytest.mark.parametrize(
+    "imports",
+    [
+        "import resourcecode; import plotly.io as pio",
+        "import plotly.io as pio; import resourcecode",
+    ],
+)
+def test_plotly_theme_is_the_default_one(imports):
+    code = f"{imports}; assert pio.templates.default == 'plotly+resourcecode'"
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_pandas_netcdf_methods(tmp_path):
+    import pandas as pd
+    import resourcecode  # noqa
+
+    dataframe = pd.DataFrame(
+        {"hs": [1.0, 2.0]}, index=pd.date_range("2020-01-01", periods=2, name="time")
+    )
+    dataframe.to_netcdf(tmp_path / "data.nc")
+    pd.testing.assert_frame_equal(
+        pd.read_netcdf(tmp_path / "data.nc"), dataframe, check_freq=False
+    )
+
+
+def test_unknown_attribute():
+    import resourcecode
+
+    with pytest.raises(AttributeError, match="no attribute 'unknown'"):
+        resourcecode.unknown
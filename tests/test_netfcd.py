@@ -17,6 +17,9 @@
 # You should have received a copy of the GNU General Public License along
 # with Resourcecode. If not, see <https://www.gnu.org/licenses/>.
 
+import io
+
+import netCDF4
 import pandas as pd
 import xarray
 import pytest
@@ -54,3 +57,66 @@ def test_encoding_is_exported(dataframe):
     assert xr.hs.attrs["units"] == "m"
     assert xr.hs.attrs["long_name"] == "significant height of wind and swell waves"
     assert xr.hs.encoding["scale_factor"] == 0.002
+
+
+def test_variables_are_packed(dataframe, tmp_path):
+    dataframe["t02"] = [10.0, float("nan"), 1e6]
+    dataframe.to_netcdf(tmp_path / "data.nc")
+
+    with netCDF4.Dataset(tmp_path / "data.nc") as dataset:
+        dataset.set_auto_maskandscale(False)
+        hs = dataset["hs"]
+        assert hs.dtype == "int16"
+        assert hs._FillValue == -32767
+        assert list(hs[:]) == [500, 1000, 1500]
+        assert hs.filters()["zlib"] and hs.filters()["shuffle"]
+        assert hs.chunking() == [3]
+        # the missing value is filled, the large one clipped
+        assert list(dataset["t02"][:]) == [1000, -32767, 32767]
+
+    data = pd.read_netcdf(tmp_path / "data.nc")
+    assert data.hs.tolist() == dataframe.hs.tolist()
+    assert data.t02.isna().tolist() == [False, True, False]
+
+
+@pytest.mark.parametrize("compression", [None, "fast", "max"])
+def test_compression_presets(dataframe, tmp_path, compression):
+    dataframe.to_netcdf(tmp_path / "data.nc", compression=compression)
+    with netCDF4.Dataset(tmp_path / "data.nc") as dataset:
+        assert dataset["hs"].filters()["zlib"] is (compression is not None)
+    assert pd.read_netcdf(tmp_path / "data.nc").equals(dataframe)
+
+    with pytest.raises(ValueError, match="compression must be one of"):
+        dataframe.to_netcdf(tmp_path / "data.nc", compression="other")
+
+
+def test_file_object_export(dataframe):
+    fobj = io.BytesIO()
+    dataframe.to_netcdf(fobj)
+    xr = xarray.open_dataset(io.BytesIO(fobj.getvalue()), engine="scipy")
+    assert xr.hs.encoding["scale_factor"] == 0.002
+    assert pd.read_netcdf(io.BytesIO(fobj.getvalue())).equals(dataframe)
+
+
+def test_unpacked_export(dataframe, tmp_path):
+    dataframe["hs"] += 0.0001
+    dataframe.to_netcdf(tmp_path / "data.nc", pack=False)
+
+    xr = xarray.open_dataset(tmp_path / "data.nc")
+    assert xr.hs.encoding["dtype"] == "float64"
+    assert "scale_factor" not in xr.hs.encoding
+    assert xr.hs.attrs["units"] == "m"
+    assert pd.read_netcdf(tmp_path / "data.nc").equals(dataframe)
+
+
+def test_multiple_points_export(tmp_path):
+    index = pd.MultiIndex.from_product(
+        [[1, 2], pd.date_range("2020/01/01", periods=10, freq="h")],
+        names=["pointId", "time"],
+    )
+    dataframe = pd.DataFrame({"hs": range(20)}, index=index, dtype=float)
+    dataframe.to_netcdf(tmp_path / "data.nc")
+
+    with netCDF4.Dataset(tmp_path / "data.nc") as dataset:
+        assert dataset["hs"].chunking() == [1, 10]
+    pd.testing.assert_frame_equal(pd.read_netcdf(tmp_path / "data.nc"), dataframe)
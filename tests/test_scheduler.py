@@ -0,0 +1,112 @@
+# coding: utf-8
+
+# Copyright 2020-2022 IFREMER (Brest, FRANCE), all rights reserved.
+# contact -- mailto:nicolas.raillard@ifremer.fr
+#
+# This file is part of Resourcecode.
+#
+# Resourcecode is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 3.0 of the License, or any later version.
+#
+# Resourcecode is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along
+# with Resourcecode. If not, see <https://www.gnu.org/licenses/>.
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import resourcecode
+from resourcecode.scheduler import RequestScheduler, INTERACTIVE, BATCH
+
+
+def test_rate_limit():
+    scheduler = RequestScheduler(rate=20)
+
+    start = time.monotonic()
+    for _ in range(30):
+        with scheduler.slot():
+            pass
+    elapsed = time.monotonic() - start
+
+    # the first 20 queries are a burst, the next 10 are sent at 20 per second
+    assert 0.4 < elapsed < 1.5
+
+
+def test_max_connections():
+    scheduler = RequestScheduler(max_connections=3)
+    lock = threading.Lock()
+    running = []
+    max_running = 0
+
+    def query(i):
+        nonlocal max_running
+        with scheduler.slot():
+            with lock:
+                running.append(i)
+                max_running = max(max_running, len(running))
+            time.sleep(0.01)
+            with lock:
+                running.remove(i)
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        list(executor.map(query, range(30)))
+
+    assert max_running == 3
+
+
+def test_priorities():
+    scheduler = RequestScheduler(max_connections=1)
+    order = []
+
+    def query(name, priority):
+        with scheduler.slot(priority):
+            order.append(name)
+
+    scheduler.acquire()
+    threads = []
+    for name, priority in [
+        ("batch-1", BATCH),
+        ("batch-2", BATCH),
+        ("interactive", INTERACTIVE),
+    ]:
+        thread = threading.Thread(target=query, args=(name, priority))
+        thread.start()
+        threads.append(thread)
+        # make sure the queries are queued in this order
+        while len(scheduler._waiting) < len(threads):
+            time.sleep(0.001)
+    scheduler.release()
+
+    for thread in threads:
+        thread.join()
+    assert order == ["interactive", "batch-1", "batch-2"]
+
+
+def test_invalid_scheduler():
+    with pytest.raises(ValueError):
+        RequestScheduler(rate=-1)
+    with pytest.raises(ValueError):
+        RequestScheduler(max_connections=0)
+
+
+def test_client_scheduler():
+    client = resourcecode.Client(rate_limit=5, max_connections=2)
+    assert client.scheduler.rate == 5
+    assert client.scheduler.max_connections == 2
+
+    client = resourcecode.Client(rate_limit=0)
+    assert client.scheduler.rate is None
+
+    # by default, neither the rate nor the connections are limited beyond the
+    # workers of the client
+    client = resourcecode.Client(max_workers=32)
+    assert client.scheduler.rate is None
+    assert client.scheduler.max_connections == 32